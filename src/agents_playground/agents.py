@@ -1,8 +1,11 @@
 """Base agent implementations."""
 
+import hashlib
 import os
+import threading
 from abc import ABC, abstractmethod
-from typing import Optional
+from collections import OrderedDict
+from typing import Iterator, Optional
 
 import google.generativeai as genai
 from pydantic import BaseModel
@@ -23,12 +26,17 @@ class AgentConfig(BaseModel):
     model: str = "gemini-2.0-flash-exp"
     temperature: float = 0.7
     max_tokens: Optional[int] = None
+    # Reject prompts larger than this budget. Checking costs one extra
+    # count_tokens round trip per request, so it is off (None) by default.
+    max_input_tokens: Optional[int] = None
     provider: str = "gemini"  # gemini, openai, or anthropic
 
 
 class GeminiAgent(BaseAgent):
     """Google Gemini 2.0 Flash agent implementation."""
     
+    RESPONSE_CACHE_SIZE = 128  # Most recent deterministic responses kept in memory
+    
     def __init__(self, config: Optional[AgentConfig] = None):
         self.config = config or AgentConfig()
         api_key = os.getenv("GOOGLE_API_KEY")
@@ -36,21 +44,85 @@ class GeminiAgent(BaseAgent):
             raise ValueError("GOOGLE_API_KEY environment variable is required")
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(self.config.model)
+        self._response_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._response_cache_lock = threading.Lock()
     
     def respond(self, message: str) -> str:
-        """Generate a response using Gemini."""
+        """Generate a response using Gemini.
+        
+        At temperature 0 the output is deterministic, so responses are cached
+        (LRU, RESPONSE_CACHE_SIZE entries) by model, generation config and
+        prompt, and an identical request skips the round trip.
+        """
+        cacheable = self.config.temperature == 0
+        if cacheable:
+            cache_key = self._response_cache_key(message)
+            with self._response_cache_lock:
+                cached = self._response_cache.get(cache_key)
+                if cached is not None:
+                    self._response_cache.move_to_end(cache_key)
+                    return cached
+        
         try:
+            self._check_input_budget(message)
             response = self.model.generate_content(
                 message,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=self.config.temperature,
-                    max_output_tokens=self.config.max_tokens
-                )
+                generation_config=self._generation_config()
             )
+            if cacheable:
+                with self._response_cache_lock:
+                    self._response_cache[cache_key] = response.text
+                    if len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+                        self._response_cache.popitem(last=False)
             return response.text
         except Exception as e:
             return f"Error generating response: {str(e)}"
 
+    def respond_stream(self, message: str) -> Iterator[str]:
+        """Generate a response using Gemini, yielding text chunks as they arrive."""
+        try:
+            self._check_input_budget(message)
+            response = self.model.generate_content(
+                message,
+                generation_config=self._generation_config(),
+                stream=True
+            )
+            for chunk in response:
+                # Safety or finish-only chunks carry no parts, and reading
+                # .text on them raises
+                if chunk.parts and chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            yield f"Error generating response: {str(e)}"
+
+    def _response_cache_key(self, message: str) -> str:
+        """Hash everything that shapes the response: model, generation config and prompt."""
+        key = f"{self.config.model}\0{self.config.temperature}\0{self.config.max_tokens}\0{message}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _generation_config(self) -> genai.types.GenerationConfig:
+        """Build the generation config shared by respond and respond_stream."""
+        return genai.types.GenerationConfig(
+            temperature=self.config.temperature,
+            max_output_tokens=self.config.max_tokens
+        )
+
+    def _check_input_budget(self, message: str) -> None:
+        """Raise if the prompt exceeds the configured input token budget.
+        
+        When a budget is set this makes one count_tokens API call before every
+        generation request; with no budget it returns without a network call.
+        """
+        if self.config.max_input_tokens is None:
+            return
+        
+        input_tokens = self.model.count_tokens(message).total_tokens
+        if input_tokens > self.config.max_input_tokens:
+            raise ValueError(
+                f"Prompt is {input_tokens} tokens, over the "
+                f"{self.config.max_input_tokens} token input budget"
+            )
+
 
 class SimpleAgent(BaseAgent):
     """A simple demonstration agent."""
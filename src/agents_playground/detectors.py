@@ -5,7 +5,44 @@ from typing import List, Dict, Optional
 from dataclasses import dataclass
 import re
 
-from .file_context import FileContextManager, FileContext
+from .file_context import SHARED_CONTEXT_MANAGER, FileContext, FileStatus
+
+
+# Pattern lists compiled once into single alternations so each patch/path
+# is scanned in one pass instead of once per pattern.
+_JS_ADAPTER_FILE_RE = re.compile(
+    r'modules/[^/]+(?:BidAdapter|AnalyticsAdapter|RtdProvider|IdSystem)\.js$'
+)
+_GO_ALIAS_RE = re.compile(r'\+ {0,2}aliasOf ?:')  # '+aliasOf:', '+  aliasOf :', ...
+_JAVA_ALIAS_PROPERTIES_RE = re.compile(
+    r'\+\s*adapters\.\w+\.aliases\.\w+\.(?:enabled\s*=\s*true|endpoint\s*=)',
+    re.IGNORECASE
+)
+_JAVA_ALIAS_YAML_CONFIG_RE = re.compile(
+    r'^\+\s{8}enabled:\s*(?:true|false)\s*$'
+    r'|^\+\s{8}endpoint:\s*.+$'
+    r'|^\+\s{6}[\w\-]+:\s*~\s*$',
+    re.MULTILINE
+)
+
+_JS_ENDPOINT_KEYWORDS = ('BASE_URLS', 'ENDPOINTS', 'endpoints', 'baseUrl')
+
+
+def _more_files_added_than_modified(file_context: FileContext) -> bool:
+    """Whether a PR creates more files than it modifies, across all categories."""
+    # Count in one pass without concatenating the category lists
+    added_files = modified_files = 0
+    for files in (
+        file_context.adapter_files, file_context.test_files, file_context.config_files,
+        file_context.core_files, file_context.build_files, file_context.doc_files, file_context.other_files
+    ):
+        for fc in files:
+            if fc.status is FileStatus.ADDED:
+                added_files += 1
+            elif fc.status is FileStatus.MODIFIED:
+                modified_files += 1
+    
+    return added_files > modified_files
 
 
 @dataclass
@@ -25,8 +62,12 @@ class BaseDetector(ABC):
     """Base class for all category detectors."""
     
     @abstractmethod
-    def detect(self, pr_info) -> DetectionResult:
-        """Detect if PR belongs to this category."""
+    def detect(self, pr_info, file_context: Optional[FileContext] = None) -> DetectionResult:
+        """Detect if PR belongs to this category.
+        
+        file_context may be passed in when the caller has already built it for
+        this PR, so it is shared across detectors instead of rebuilt by each.
+        """
         pass
     
     @abstractmethod
@@ -67,11 +108,11 @@ class NewAdaptersModulesDetector(BaseDetector):
     def get_category_name(self) -> str:
         return "New Adapters & Modules"
     
-    def detect(self, pr_info) -> DetectionResult:
+    def detect(self, pr_info, file_context: Optional[FileContext] = None) -> DetectionResult:
         """Detect new adapters/modules based on repo type and file patterns."""
-        # Create file context from pr_info
-        context_manager = FileContextManager()
-        file_context = context_manager.create_file_context(pr_info)
+        # Create file context from pr_info unless the caller already built one
+        if file_context is None:
+            file_context = SHARED_CONTEXT_MANAGER.create_file_context(pr_info)
         
         if file_context.repo_type.value == 'javascript':
             return self._detect_javascript_new_adapter(file_context)
@@ -95,20 +136,8 @@ class NewAdaptersModulesDetector(BaseDetector):
         
         if new_adapter_files:
             # Filter for actual adapter patterns
-            js_adapter_patterns = [
-                r'modules/[^/]+BidAdapter\.js$',
-                r'modules/[^/]+AnalyticsAdapter\.js$', 
-                r'modules/[^/]+RtdProvider\.js$',
-                r'modules/[^/]+IdSystem\.js$'
-            ]
-            
-            actual_adapters = []
-            for file_path in new_adapter_files:
-                for pattern in js_adapter_patterns:
-                    if re.match(pattern, file_path):
-                        actual_adapters.append(file_path)
-                        break
-            new_adapter_files = actual_adapters
+            new_adapter_files = [file_path for file_path in new_adapter_files
+                                 if _JS_ADAPTER_FILE_RE.match(file_path)]
         
         if new_adapter_files:
             return DetectionResult(
@@ -145,19 +174,12 @@ class NewAdaptersModulesDetector(BaseDetector):
         for file_change in file_context.config_files:
             if file_change.path.startswith('static/bidder-info/') and file_change.path.endswith('.yaml'):
                 patch = file_change.patch or ''
-                if patch:
-                    alias_patterns = [
-                        '+aliasOf:', '+ aliasOf:', '+  aliasOf:',
-                        '+ aliasOf :', '+aliasOf :', '+  aliasOf :'
-                    ]
-                    
-                    for pattern in alias_patterns:
-                        if pattern in patch:
-                            return DetectionResult(
-                                detected=True,
-                                metadata={'file': file_change.path, 'type': 'go_alias'},
-                                reason=f"Go alias configuration found in {file_change.path}"
-                            )
+                if patch and _GO_ALIAS_RE.search(patch):
+                    return DetectionResult(
+                        detected=True,
+                        metadata={'file': file_change.path, 'type': 'go_alias'},
+                        reason=f"Go alias configuration found in {file_change.path}"
+                    )
         
         return DetectionResult(detected=False, reason="No Go alias patterns found")
     
@@ -246,7 +268,7 @@ class NewAdaptersModulesDetector(BaseDetector):
         # aliasname: 'https://...',
         if re.search(r'^\+\s*[\w-]+:\s*[\'\"]https?://[^\'\"]+[\'\"]\s*,?\s*$', patch, re.MULTILINE):
             # Check if this is in context of URL mappings
-            if any(keyword in patch for keyword in ['BASE_URLS', 'ENDPOINTS', 'endpoints', 'baseUrl']):
+            if any(keyword in patch for keyword in _JS_ENDPOINT_KEYWORDS):
                 return True
         
         # Pattern 5: Updates to endpoint selection logic for aliases
@@ -298,16 +320,8 @@ class NewAdaptersModulesDetector(BaseDetector):
     
     def _has_java_alias_properties(self, patch: str) -> bool:
         """Check for Java alias patterns in properties files."""
-        alias_patterns = [
-            r'\+adapters\.\w+\.aliases\.\w+\.enabled\s*=\s*true',
-            r'\+adapters\.\w+\.aliases\.\w+\.endpoint\s*=',
-            r'\+\s*adapters\.\w+\.aliases\.\w+\.enabled\s*=\s*true',
-            r'\+\s*adapters\.\w+\.aliases\.\w+\.endpoint\s*='
-        ]
-        
-        for pattern in alias_patterns:
-            if re.search(pattern, patch, re.IGNORECASE):
-                return True
+        if _JAVA_ALIAS_PROPERTIES_RE.search(patch):
+            return True
         
         return '+' in patch and '.aliases.' in patch and ('enabled' in patch or 'endpoint' in patch)
     
@@ -322,15 +336,8 @@ class NewAdaptersModulesDetector(BaseDetector):
             return True
         
         # Look for alias configuration lines
-        alias_config_patterns = [
-            r'^\+\s{8}enabled:\s*(true|false)\s*$',
-            r'^\+\s{8}endpoint:\s*.+$',
-            r'^\+\s{6}[\w\-]+:\s*~\s*$'
-        ]
-        
-        for pattern in alias_config_patterns:
-            if re.search(pattern, patch, re.MULTILINE) and 'aliases' in patch:
-                return True
+        if 'aliases' in patch and _JAVA_ALIAS_YAML_CONFIG_RE.search(patch):
+            return True
         
         return False
     
@@ -375,11 +382,11 @@ class TestingBuildDocsDetector(BaseDetector):
     def get_category_name(self) -> str:
         return "Testing / Build Process / Docs Updates"
     
-    def detect(self, pr_info) -> DetectionResult:
+    def detect(self, pr_info, file_context: Optional[FileContext] = None) -> DetectionResult:
         """Detect testing, build, or documentation changes."""
-        # Create file context from pr_info
-        context_manager = FileContextManager()
-        file_context = context_manager.create_file_context(pr_info)
+        # Create file context from pr_info unless the caller already built one
+        if file_context is None:
+            file_context = SHARED_CONTEXT_MANAGER.create_file_context(pr_info)
         
         # Gather all test/build/docs files from categorized context
         test_build_docs_files = []
@@ -406,11 +413,11 @@ class AdapterModuleChangesDetector(BaseDetector):
     def get_category_name(self) -> str:
         return "Adapter & Module Features" if self.is_feature else "Adapter & Module Updates"
     
-    def detect(self, pr_info) -> DetectionResult:
+    def detect(self, pr_info, file_context: Optional[FileContext] = None) -> DetectionResult:
         """Detect adapter/module changes and determine if feature or update."""
-        # Create file context from pr_info
-        context_manager = FileContextManager()
-        file_context = context_manager.create_file_context(pr_info)
+        # Create file context from pr_info unless the caller already built one
+        if file_context is None:
+            file_context = SHARED_CONTEXT_MANAGER.create_file_context(pr_info)
         
         if not self._is_adapter_or_module_change(file_context):
             return DetectionResult(detected=False, reason="Not an adapter/module change")
@@ -438,16 +445,7 @@ class AdapterModuleChangesDetector(BaseDetector):
     
     def _is_new_feature_change(self, file_context: FileContext) -> bool:
         """Determine if this is a new feature based on file creation vs modification."""
-        # Count added vs modified files across all categories
-        all_files = (
-            file_context.adapter_files + file_context.test_files + file_context.config_files +
-            file_context.core_files + file_context.build_files + file_context.doc_files + file_context.other_files
-        )
-        
-        added_files = sum(1 for fc in all_files if fc.status.value == 'added')
-        modified_files = sum(1 for fc in all_files if fc.status.value == 'modified')
-        
-        return added_files > modified_files
+        return _more_files_added_than_modified(file_context)
 
 
 class CoreChangesDetector(BaseDetector):
@@ -459,11 +457,11 @@ class CoreChangesDetector(BaseDetector):
     def get_category_name(self) -> str:
         return "Core Features" if self.is_feature else "Core Updates"
     
-    def detect(self, pr_info) -> DetectionResult:
+    def detect(self, pr_info, file_context: Optional[FileContext] = None) -> DetectionResult:
         """Detect core changes and determine if feature or update."""
-        # Create file context from pr_info
-        context_manager = FileContextManager()
-        file_context = context_manager.create_file_context(pr_info)
+        # Create file context from pr_info unless the caller already built one
+        if file_context is None:
+            file_context = SHARED_CONTEXT_MANAGER.create_file_context(pr_info)
         
         if not self._is_core_change(file_context):
             return DetectionResult(detected=False, reason="Not a core change")
@@ -489,15 +487,9 @@ class CoreChangesDetector(BaseDetector):
         """Check if PR affects core system files."""
         return len(file_context.core_files) > 0
     
-    def _is_new_feature_change(self, pr_info) -> bool:
+    def _is_new_feature_change(self, file_context: FileContext) -> bool:
         """Determine if this is a new feature based on file creation vs modification."""
-        if not hasattr(pr_info, 'file_changes') or not pr_info.file_changes:
-            return False
-        
-        added_files = sum(1 for changes in pr_info.file_changes.values() if changes.get('status') == 'added')
-        modified_files = sum(1 for changes in pr_info.file_changes.values() if changes.get('status') == 'modified')
-        
-        return added_files > modified_files
+        return _more_files_added_than_modified(file_context)
 
 
 class OtherDetector(BaseDetector):
@@ -506,7 +498,7 @@ class OtherDetector(BaseDetector):
     def get_category_name(self) -> str:
         return "Other"
     
-    def detect(self, pr_info) -> DetectionResult:
+    def detect(self, pr_info, file_context: Optional[FileContext] = None) -> DetectionResult:
         """Always detects (fallback category)."""
         return DetectionResult(
             detected=True,
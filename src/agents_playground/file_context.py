@@ -1,7 +1,8 @@
 """File context management for PR analysis."""
 
+import re
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 from dataclasses import dataclass
 from enum import Enum
 
@@ -21,7 +22,7 @@ class RepoType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class FileChange:
     """Represents a single file change."""
     path: str
@@ -44,6 +45,77 @@ class FileContext:
     other_files: List[FileChange]
 
 
+def _substring_re(*needles: str, startswith: tuple = (), endswith: tuple = ()) -> re.Pattern:
+    """Compile one alternation matching any needle, any startswith prefix or any endswith suffix."""
+    alternatives = [re.escape(needle) for needle in needles]
+    alternatives += ['^' + re.escape(prefix) for prefix in startswith]
+    alternatives += [re.escape(suffix) + r'\Z' for suffix in endswith]
+    return re.compile('|'.join(alternatives))
+
+
+# Substring tables used by the classifiers, each compiled once into a single
+# pattern so a path is scanned in one regex search rather than once per entry.
+# Branches that mixed startswith/endswith/in checks are folded into one pattern.
+_DOCS_RE = _substring_re('docs/', endswith=('.md',))
+_MOBILE_DOCS_RE = _substring_re('docs/', 'documentation/', endswith=('.md',))
+
+_JS_ADAPTER_SUFFIXES_RE = _substring_re('bidadapter.js', 'analyticsadapter.js', 'rtdprovider.js', 'idsystem.js')
+_JS_TEST_RE = _substring_re('test/', endswith=('.spec.js',))
+_JS_BUILD_RE = _substring_re(
+    'webpack', 'gulp', 'package.json', 'karma', 'babel',
+    'wdio', 'eslint', 'browsers.json',
+    startswith=('.',)
+)
+_JS_DOCS_RE = _substring_re('docs/', 'integrationexamples/', endswith=('.md',))
+_JS_LIBRARY_HELPER_SUFFIXES_RE = _substring_re('utils', 'constants')
+_JS_CORE_LIBRARY_EXCEPTIONS_RE = _substring_re(
+    'currencyutils', 'fpdutils', 'gptutils', 'ortb2utils',
+    'sizeutils', 'transformparamsutils', 'urlutils', 'xmlutils'
+)
+
+_GO_ADAPTER_RE = _substring_re('adapters/', 'static/bidder-info/', 'analytics/')
+_GO_CORE_MODULE_DIRS_RE = _substring_re('prebid/', 'generator/', 'moduledeps/')
+_GO_TEST_RE = _substring_re('test/', endswith=('_test.go',))
+_GO_BUILD_RE = _substring_re('makefile', 'dockerfile', 'go.mod', startswith=('.',))
+
+_JAVA_ADAPTER_RE = _substring_re(
+    'src/main/java/org/prebid/server/bidder/',
+    'src/main/resources/bidder-config/',
+    'src/test/java/org/prebid/server/bidder/',
+    'src/test/java/org/prebid/server/it/'
+)
+_JAVA_TEST_RE = _substring_re('src/test/', 'test-application.properties')
+_JAVA_BUILD_RE = _substring_re('pom.xml', 'dockerfile', startswith=('.',))
+
+_IOS_MODULE_PATHS_RE = _substring_re(
+    'prebidrenderingapi/', 'prebidobjc/', 'prebidmobile/',
+    'sources/', 'frameworks/', '.framework/', 'modules/'
+)
+_IOS_SOURCE_EXTS_RE = _substring_re('.swift', '.m', '.h')
+_IOS_TEST_PATHS_RE = _substring_re('test/', 'tests/', 'uitest', 'unittests/', '.xctest')
+_IOS_CONFIG_FILES_RE = _substring_re('info.plist', 'podfile', '.podspec', 'project.pbxproj', 'scheme')
+_IOS_BUILD_RE = _substring_re('fastfile', '.yml', '.yaml', 'makefile', startswith=('.',))
+_IOS_CORE_PATHS_RE = _substring_re('prebidrenderingapi/core', 'prebidmobile/core', 'sources/core')
+
+_ANDROID_MODULE_PATHS_RE = _substring_re(
+    'prebidrenderingapi/', 'prebidobjc/', 'prebidmobile/',
+    'src/main/java/', 'src/main/kotlin/', 'modules/', 'library/'
+)
+_ANDROID_SOURCE_EXTS_RE = _substring_re('.java', '.kt', '.xml')
+_ANDROID_TEST_PATHS_RE = _substring_re('src/test/', 'src/androidtest/', 'test/', 'tests/', 'uitest/')
+_ANDROID_CONFIG_FILES_RE = _substring_re(
+    'build.gradle', 'gradle.properties', 'androidmanifest.xml',
+    'proguard', 'gradle-wrapper'
+)
+_ANDROID_BUILD_RE = _substring_re(
+    '.yml', '.yaml', 'makefile', 'fastfile', 'gemfile',
+    startswith=('.',)
+)
+_ANDROID_CORE_PATHS_RE = _substring_re(
+    'prebidrenderingapi/core', 'prebidmobile/core', 'src/main/java/org/prebid/mobile/core'
+)
+
+
 class FileClassifier(ABC):
     """Abstract base class for repo-specific file classifiers."""
     
@@ -68,30 +140,21 @@ class JavaScriptFileClassifier(FileClassifier):
         """Classify JavaScript files."""
         path = file_change.path.lower()
         
-        if 'modules/' in path and any(suffix in path for suffix in [
-            'bidadapter.js', 'analyticsadapter.js', 'rtdprovider.js', 'idsystem.js'
-        ]):
+        if 'modules/' in path and _JS_ADAPTER_SUFFIXES_RE.search(path):
             return 'adapter'
         elif 'test/spec/modules/' in path:
             return 'adapter'  # Module/adapter-specific tests
-        elif 'test/' in path or path.endswith('.spec.js'):
+        elif _JS_TEST_RE.search(path):
             return 'test'
-        elif path.startswith('.') or any(name in path for name in [
-            'webpack', 'gulp', 'package.json', 'karma', 'babel',
-            'wdio', 'eslint', 'browsers.json'
-        ]):
+        elif _JS_BUILD_RE.search(path):
             return 'build'
-        elif path.endswith('.md') or 'docs/' in path or 'integrationexamples/' in path:
+        elif _JS_DOCS_RE.search(path):
             return 'doc'
         elif 'libraries/' in path:
             # Check if it's a Utils or Constants file
-            if any(suffix in path for suffix in ['utils', 'constants']):
+            if _JS_LIBRARY_HELPER_SUFFIXES_RE.search(path):
                 # Core exceptions - these Utils/Constants are core functionality
-                core_exceptions = [
-                    'currencyutils', 'fpdutils', 'gptutils', 'ortb2utils', 
-                    'sizeutils', 'transformparamsutils', 'urlutils', 'xmlutils'
-                ]
-                if any(exception in path for exception in core_exceptions):
+                if _JS_CORE_LIBRARY_EXCEPTIONS_RE.search(path):
                     return 'core'
                 else:
                     return 'adapter'  # All other Utils/Constants are adapter-related
@@ -113,24 +176,24 @@ class GoFileClassifier(FileClassifier):
         """Classify Go files."""
         path = file_change.path.lower()
         
-        if 'adapters/' in path or 'static/bidder-info/' in path or 'analytics/' in path:
+        if _GO_ADAPTER_RE.search(path):
             return 'adapter'
         elif 'modules/' in path:
             # Extract what comes after modules/
             module_path = path.split('modules/', 1)[1]
             # Core infrastructure directories
-            if any(core_dir in module_path for core_dir in ['prebid/', 'generator/', 'moduledeps/']):
+            if _GO_CORE_MODULE_DIRS_RE.search(module_path):
                 return 'core'
             # If it has a subdirectory (contains /) it's a third-party module
             elif '/' in module_path:
                 return 'adapter'  # Third-party modules with subdirectories
             else:
                 return 'core'  # Top-level module files (like modules.go)
-        elif 'test/' in path or path.endswith('_test.go'):
+        elif _GO_TEST_RE.search(path):
             return 'test'
-        elif path.startswith('.') or any(name in path for name in ['makefile', 'dockerfile', 'go.mod']):
+        elif _GO_BUILD_RE.search(path):
             return 'build'
-        elif path.endswith('.md') or 'docs/' in path:
+        elif _DOCS_RE.search(path):
             return 'doc'
         else:
             return 'core'  # Everything else not in adapters/analytics/modules is core
@@ -146,16 +209,13 @@ class JavaFileClassifier(FileClassifier):
         """Classify Java files."""
         path = file_change.path.lower()
         
-        if ('src/main/java/org/prebid/server/bidder/' in path or
-            'src/main/resources/bidder-config/' in path or
-            'src/test/java/org/prebid/server/bidder/' in path or
-            'src/test/java/org/prebid/server/it/' in path):
+        if _JAVA_ADAPTER_RE.search(path):
             return 'adapter'  # Bidder implementations, configs, and adapter-specific tests
-        elif 'src/test/' in path or 'test-application.properties' in path:
+        elif _JAVA_TEST_RE.search(path):
             return 'test'  # General tests
-        elif path.startswith('.') or any(name in path for name in ['pom.xml', 'dockerfile']):
+        elif _JAVA_BUILD_RE.search(path):
             return 'build'
-        elif path.endswith('.md') or 'docs/' in path:
+        elif _DOCS_RE.search(path):
             return 'doc'
         elif 'src/main/java/org/prebid/server/' in path and 'bidder/' not in path:
             return 'core'
@@ -174,26 +234,18 @@ class iOSFileClassifier(FileClassifier):
         path = file_change.path.lower()
         
         # iOS modules/SDKs (using adapter category for consistency)
-        if any(module_path in path for module_path in [
-            'prebidrenderingapi/', 'prebidobjc/', 'prebidmobile/',
-            'sources/', 'frameworks/', '.framework/', 'modules/'
-        ]) and any(ext in path for ext in ['.swift', '.m', '.h']):
+        if _IOS_MODULE_PATHS_RE.search(path) and \
+           _IOS_SOURCE_EXTS_RE.search(path):
             return 'adapter'  # Mobile modules
-        elif any(test_path in path for test_path in [
-            'test/', 'tests/', 'uitest', 'unittests/', '.xctest'
-        ]):
+        elif _IOS_TEST_PATHS_RE.search(path):
             return 'test'
-        elif any(config_file in path for config_file in [
-            'info.plist', 'podfile', '.podspec', 'project.pbxproj', 'scheme'
-        ]):
+        elif _IOS_CONFIG_FILES_RE.search(path):
             return 'config'
-        elif path.startswith('.') or any(build_file in path for build_file in ['fastfile', '.yml', '.yaml', 'makefile']):
+        elif _IOS_BUILD_RE.search(path):
             return 'build'
-        elif path.endswith('.md') or 'docs/' in path or 'documentation/' in path:
+        elif _MOBILE_DOCS_RE.search(path):
             return 'doc'
-        elif any(core_path in path for core_path in [
-            'prebidrenderingapi/core', 'prebidmobile/core', 'sources/core'
-        ]):
+        elif _IOS_CORE_PATHS_RE.search(path):
             return 'core'
         else:
             return 'other'
@@ -210,29 +262,18 @@ class AndroidFileClassifier(FileClassifier):
         path = file_change.path.lower()
         
         # Android modules/SDKs (using adapter category for consistency)
-        if any(module_path in path for module_path in [
-            'prebidrenderingapi/', 'prebidobjc/', 'prebidmobile/',
-            'src/main/java/', 'src/main/kotlin/', 'modules/', 'library/'
-        ]) and any(ext in path for ext in ['.java', '.kt', '.xml']):
+        if _ANDROID_MODULE_PATHS_RE.search(path) and \
+           _ANDROID_SOURCE_EXTS_RE.search(path):
             return 'adapter'  # Mobile modules
-        elif any(test_path in path for test_path in [
-            'src/test/', 'src/androidtest/', 'test/', 'tests/', 'uitest/'
-        ]):
+        elif _ANDROID_TEST_PATHS_RE.search(path):
             return 'test'
-        elif any(config_file in path for config_file in [
-            'build.gradle', 'gradle.properties', 'androidmanifest.xml', 
-            'proguard', 'gradle-wrapper'
-        ]):
+        elif _ANDROID_CONFIG_FILES_RE.search(path):
             return 'config'
-        elif path.startswith('.') or any(build_file in path for build_file in [
-            '.yml', '.yaml', 'makefile', 'fastfile', 'gemfile'
-        ]):
+        elif _ANDROID_BUILD_RE.search(path):
             return 'build'
-        elif path.endswith('.md') or 'docs/' in path or 'documentation/' in path:
+        elif _MOBILE_DOCS_RE.search(path):
             return 'doc'
-        elif any(core_path in path for core_path in [
-            'prebidrenderingapi/core', 'prebidmobile/core', 'src/main/java/org/prebid/mobile/core'
-        ]):
+        elif _ANDROID_CORE_PATHS_RE.search(path):
             return 'core'
         else:
             return 'other'
@@ -255,27 +296,36 @@ class FileContextManager:
         if not files:
             return RepoType.UNKNOWN
         
-        # JavaScript patterns
-        if any('modules/' in f and f.endswith('.js') for f in files):
-            return RepoType.JAVASCRIPT
-        
-        # Go patterns
-        if any(f.endswith('.go') for f in files) or any('static/bidder-info/' in f for f in files):
-            return RepoType.GO
-        
-        # Java server patterns
-        if any('src/main/java/org/prebid/server/' in f for f in files):
-            return RepoType.JAVA
-        
-        # iOS patterns
-        if any(f.endswith(('.swift', '.m', '.h')) for f in files) or \
-           any('ios' in f.lower() or '.xcodeproj' in f or '.podspec' in f for f in files):
-            return RepoType.IOS
+        # Single pass over the files, recording which repo types have evidence.
+        # JavaScript has the highest priority so it can return immediately.
+        matched = set()
+        for f in files:
+            # JavaScript patterns
+            if 'modules/' in f and f.endswith('.js'):
+                return RepoType.JAVASCRIPT
+            
+            # Go patterns
+            if f.endswith('.go') or 'static/bidder-info/' in f:
+                matched.add(RepoType.GO)
+            
+            # Java server patterns
+            if 'src/main/java/org/prebid/server/' in f:
+                matched.add(RepoType.JAVA)
+            
+            f_lower = f.lower()
+            
+            # iOS patterns
+            if f.endswith(('.swift', '.m', '.h')) or 'ios' in f_lower or '.xcodeproj' in f or '.podspec' in f:
+                matched.add(RepoType.IOS)
+            
+            # Android patterns
+            if f.endswith(('.kt', '.java')) or 'android' in f_lower or 'build.gradle' in f:
+                matched.add(RepoType.ANDROID)
         
-        # Android patterns
-        if any(f.endswith(('.kt', '.java')) for f in files) or \
-           any('android' in f.lower() or 'build.gradle' in f for f in files):
-            return RepoType.ANDROID
+        # Remaining repo types in priority order
+        for repo_type in (RepoType.GO, RepoType.JAVA, RepoType.IOS, RepoType.ANDROID):
+            if repo_type in matched:
+                return repo_type
         
         return RepoType.UNKNOWN
     
@@ -327,12 +377,22 @@ class FileContextManager:
         )
 
 
-@dataclass
+# FileContextManager holds only stateless classifiers, so one instance is
+# shared by the detectors, the release agent and every PRFileAnalyzer
+SHARED_CONTEXT_MANAGER = FileContextManager()
+
+
+@dataclass(slots=True)
 class EnrichedFileChange(FileChange):
     """FileChange with additional context categorization."""
     category: str = 'other'  # adapter, core, test, build, doc, config, other
 
 
+# Per-category summary fields, in output order, and the slot each status counts into
+_SUMMARY_FIELDS = ('files', 'added', 'modified', 'removed', 'total_additions', 'total_deletions')
+_SUMMARY_STATUS_INDEX = {FileStatus.ADDED: 1, FileStatus.MODIFIED: 2, FileStatus.REMOVED: 3}
+
+
 class PRFileAnalyzer:
     """Professional-grade PR file analysis with modular extraction and categorization."""
     
@@ -344,11 +404,15 @@ class PRFileAnalyzer:
             repo_type: Repository type ('javascript', 'go', 'java', 'ios', 'android')
         """
         self.repo_type = RepoType(repo_type)
-        self.context_manager = FileContextManager()
+        self.context_manager = SHARED_CONTEXT_MANAGER
         self.classifier = self.context_manager.classifiers.get(self.repo_type)
         
         if not self.classifier:
             raise ValueError(f"Unsupported repository type: {repo_type}")
+        
+        # Classification depends only on the path, and the same paths recur
+        # across PRs (package.json, CI configs, popular adapters)
+        self._category_cache: Dict[str, str] = {}
     
     def analyze_pr(self, pr_source, source_type: str = 'github_api') -> List[EnrichedFileChange]:
         """
@@ -363,16 +427,14 @@ class PRFileAnalyzer:
         Returns:
             List of EnrichedFileChange objects with both file metrics and categorization
         """
-        # Phase 1: Extract raw file changes
+        # Phase 1: Extract raw file changes, streamed so each raw FileChange is
+        # dropped as soon as it is enriched instead of held in a second list
         raw_files = self._extract_file_changes(pr_source, source_type)
         
-        if not raw_files:
-            return []
-        
         # Phase 2: Enrich with categorization
         return self._enrich_with_categorization(raw_files)
     
-    def _extract_file_changes(self, pr_source, source_type: str) -> List[FileChange]:
+    def _extract_file_changes(self, pr_source, source_type: str) -> Iterator[FileChange]:
         """Extract raw file changes with status and metrics."""
         if source_type == 'github_api':
             return self._extract_from_github_api(pr_source)
@@ -381,47 +443,38 @@ class PRFileAnalyzer:
         else:
             raise ValueError(f"Unsupported source type: {source_type}")
     
-    def _extract_from_github_api(self, github_pr) -> List[FileChange]:
+    def _extract_from_github_api(self, github_pr) -> Iterator[FileChange]:
         """Extract from GitHub API PR object."""
-        file_changes = []
         try:
             for file_obj in github_pr.get_files():
-                file_changes.append(FileChange(
+                yield FileChange(
                     path=file_obj.filename,
                     status=FileStatus(file_obj.status),
                     additions=file_obj.additions,
                     deletions=file_obj.deletions,
                     patch=getattr(file_obj, 'patch', None)
-                ))
+                )
         except Exception as e:
             print(f"⚠️  Error extracting from GitHub API: {e}")
-        return file_changes
     
-    def _extract_from_dict(self, pr_info) -> List[FileChange]:
+    def _extract_from_dict(self, pr_info) -> Iterator[FileChange]:
         """Extract from dictionary/existing format."""
-        file_changes = []
-        
         if hasattr(pr_info, 'file_changes') and pr_info.file_changes:
             for path, change_info in pr_info.file_changes.items():
-                file_changes.append(FileChange(
+                yield FileChange(
                     path=path,
                     status=FileStatus(change_info.get('status', 'modified')),
                     additions=change_info.get('additions', 0),
                     deletions=change_info.get('deletions', 0),
                     patch=change_info.get('patch')
-                ))
-        
-        return file_changes
+                )
     
-    def _enrich_with_categorization(self, raw_files: List[FileChange]) -> List[EnrichedFileChange]:
+    def _enrich_with_categorization(self, raw_files: Iterable[FileChange]) -> List[EnrichedFileChange]:
         """Enrich raw file changes with contextual categorization."""
-        if not raw_files:
-            return []
-        
         # Categorize each file using the pre-configured classifier
         enriched_files = []
         for file_change in raw_files:
-            category = self.classifier.classify_file(file_change)
+            category = self._categorize_file(file_change)
             enriched_files.append(EnrichedFileChange(
                 path=file_change.path,
                 status=file_change.status,
@@ -433,21 +486,28 @@ class PRFileAnalyzer:
         
         return enriched_files
     
+    def _categorize_file(self, file_change: FileChange) -> str:
+        """Classify a file, reusing the result for paths seen before."""
+        category = self._category_cache.get(file_change.path)
+        if category is None:
+            category = self.classifier.classify_file(file_change)
+            self._category_cache[file_change.path] = category
+        return category
+    
     def get_summary_by_category(self, enriched_files: List[EnrichedFileChange]) -> Dict[str, Dict[str, int]]:
         """Get summary statistics grouped by category."""
-        summary = {}
+        # Accumulate into flat per-category count lists (indexed like
+        # _SUMMARY_FIELDS) and build the nested dicts once at the end
+        totals: Dict[str, List[int]] = {}
         
         for file_change in enriched_files:
-            category = file_change.category
-            if category not in summary:
-                summary[category] = {
-                    'files': 0, 'added': 0, 'modified': 0, 'removed': 0,
-                    'total_additions': 0, 'total_deletions': 0
-                }
+            counts = totals.get(file_change.category)
+            if counts is None:
+                counts = totals[file_change.category] = [0] * len(_SUMMARY_FIELDS)
             
-            summary[category]['files'] += 1
-            summary[category][file_change.status.value] += 1
-            summary[category]['total_additions'] += file_change.additions
-            summary[category]['total_deletions'] += file_change.deletions
+            counts[0] += 1
+            counts[_SUMMARY_STATUS_INDEX[file_change.status]] += 1
+            counts[4] += file_change.additions
+            counts[5] += file_change.deletions
         
-        return summary
\ No newline at end of file
+        return {category: dict(zip(_SUMMARY_FIELDS, counts)) for category, counts in totals.items()}
\ No newline at end of file
@@ -1,28 +1,54 @@
 """GitHub Release Analysis Agent - Analyzes PRs in releases and generates summaries."""
 
 import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from dotenv import load_dotenv
-from github import Github, Repository, PullRequest, GitCommit
-from markdown import markdown
-from lxml import html
+from github import (
+    Github, Repository, PullRequest, GitCommit, GitRelease, RateLimitExceededException
+)
 
-from agents_playground.agents import BaseAgent, AgentConfig, GeminiAgent
+from agents_playground.agents import BaseAgent, AgentConfig
 from agents_playground.detectors import (
+    DetectionResult,
     NewAdaptersModulesDetector,
     TestingBuildDocsDetector,
     AdapterModuleChangesDetector,
     CoreChangesDetector,
     OtherDetector
 )
+from agents_playground.file_context import SHARED_CONTEXT_MANAGER
 
 load_dotenv()
 
+# Release URL like: https://github.com/prebid/prebid-server/releases/tag/v3.18.0
+_GITHUB_RELEASE_URL_RE = re.compile(r'github\.com/([^/]+/[^/]+)/releases/tag/([^/?#]+)')
+
+# PR references such as "Merge pull request #123", "(#123)" or "PR #123".
+# Every such form contains "#<digits>", so one pattern covers them all.
+_PR_NUM_RE = re.compile(r'#(\d+)')
+
+# Clock for cache expiry and sleep for rate-limit backoff; module attributes so
+# tests can patch them without touching the global time module
+_monotonic = time.monotonic
+_sleep = time.sleep
+
 
-@dataclass
+def _intern(value):
+    """Intern strings that repeat across PRs (logins, labels, paths); pass others through."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(slots=True)
 class PRInfo:
     """Information about a Pull Request."""
     number: int
@@ -36,10 +62,12 @@ class PRInfo:
     additions: int
     deletions: int
     changed_files: int
-    files: List[str] = None  # List of changed file paths
+    files: List[str] = None  # List of changed file paths; None if it could not be fetched
+    file_changes: Dict[str, Dict] = field(default_factory=dict)  # Per-file status, line counts and patch
+    detection_result: Optional[DetectionResult] = None  # Set by _categorize_prs
 
 
-@dataclass
+@dataclass(slots=True)
 class ReleaseAnalysis:
     """Analysis results for a release."""
     repo_name: str
@@ -53,19 +81,57 @@ class ReleaseAnalysis:
 class GitHubReleaseAgent(BaseAgent):
     """Agent that analyzes GitHub releases and generates PR summaries."""
     
+    PR_FETCH_WORKERS = 10  # Concurrent PR fetches; kept low for GitHub's secondary rate limits
+    RATE_LIMIT_RETRIES = 2  # Retries per PR after waiting out a rate limit
+    MAX_RATE_LIMIT_WAIT = 60  # Seconds; caps the sleep before each retry
+    PR_CACHE_SIZE = 2000  # Most recently used merged PRs kept in memory
+    ANALYSIS_CACHE_SIZE = 32  # Most recent release analyses kept in memory
+    ANALYSIS_CACHE_TTL = 600  # Seconds a cached release analysis stays fresh
+    
+    # Detectors in priority order. None of them hold per-PR state, so one set
+    # is shared by every categorization instead of being rebuilt per call.
+    _DETECTORS = (
+        NewAdaptersModulesDetector(),
+        CoreChangesDetector(is_feature=True),            # Core Features
+        CoreChangesDetector(is_feature=False),           # Core Updates
+        AdapterModuleChangesDetector(is_feature=True),   # Adapter & Module Features
+        AdapterModuleChangesDetector(is_feature=False),  # Adapter & Module Updates
+        TestingBuildDocsDetector(),
+        OtherDetector()  # Fallback
+    )
+    
     def __init__(self, config: Optional[AgentConfig] = None):
         self.config = config or AgentConfig(
             name="GitHubReleaseAnalyzer",
             model="gemini-2.0-flash-exp",
-            temperature=0.3  # More consistent for analysis
+            temperature=0.0  # Analysis is rule-based; only affects future LLM calls
         )
         
         # Initialize GitHub client
         github_token = os.getenv("GITHUB_TOKEN")
         if not github_token:
             raise ValueError("GITHUB_TOKEN environment variable is required")
-        self.github = Github(github_token)
+        # 100 is GitHub's maximum page size; the default of 30 means 3x the
+        # round trips for every paginated list (releases, commits, files)
+        self.github = Github(github_token, per_page=100)
+        
+        # Merged PRs don't change, so their extracted info is reused across
+        # repeat analyses of the same or overlapping releases; LRU-bounded
+        # like the analysis cache since the agent can live for the whole process
+        self._pr_cache: "OrderedDict[Tuple[str, int], PRInfo]" = OrderedDict()
+        self._pr_cache_lock = threading.Lock()
         
+        # Repeat analyses of the same tag within ANALYSIS_CACHE_TTL are served
+        # from memory. Releases can be edited, re-published or re-tagged, so
+        # entries expire rather than living for the whole process; the cache is
+        # also bounded so long sessions don't grow forever.
+        # (repo_name, release_tag) -> (cached_at, analysis)
+        self._analysis_cache: "OrderedDict[Tuple[str, str], Tuple[float, ReleaseAnalysis]]" = OrderedDict()
+        self._analysis_cache_lock = threading.Lock()
+        
+        # PR fetches from every release in flight share these slots, so
+        # analyze_releases can't multiply the per-release worker count
+        self._pr_fetch_slots = threading.BoundedSemaphore(self.PR_FETCH_WORKERS)
     
     def respond(self, message: str) -> str:
         """Main interface - accepts multiple input formats."""
@@ -83,9 +149,7 @@ class GitHubReleaseAgent(BaseAgent):
         
         # Handle GitHub release URL format
         if "github.com" in message and "/releases/tag/" in message:
-            # Extract from URL like: https://github.com/prebid/prebid-server/releases/tag/v3.18.0
-            import re
-            match = re.search(r'github\.com/([^/]+/[^/]+)/releases/tag/([^/?#]+)', message)
+            match = _GITHUB_RELEASE_URL_RE.search(message)
             if match:
                 repo_name = match.group(1)
                 release_tag = match.group(2)
@@ -116,6 +180,16 @@ Please provide input in one of these formats:
     
     def analyze_release(self, repo_name: str, release_tag: str) -> ReleaseAnalysis:
         """Analyze a specific release and return comprehensive analysis."""
+        cache_key = (repo_name, release_tag)
+        with self._analysis_cache_lock:
+            cached = self._analysis_cache.get(cache_key)
+            if cached is not None:
+                cached_at, analysis = cached
+                if _monotonic() - cached_at < self.ANALYSIS_CACHE_TTL:
+                    self._analysis_cache.move_to_end(cache_key)
+                    return analysis
+                del self._analysis_cache[cache_key]
+        
         try:
             repo = self.github.get_repo(repo_name)
             print(f"📊 Analyzing release {release_tag} for {repo_name}...")
@@ -125,14 +199,14 @@ Please provide input in one of these formats:
             release_date = release.created_at
             
             # Get commits between previous release and this release
-            prs = self._get_prs_in_release(repo, release_tag)
+            prs = self._get_prs_in_release(repo, release)
             
             print(f"📋 Found {len(prs)} PRs in release {release_tag}")
             
             # Categorize PRs
             categories = self._categorize_prs(prs)
             
-            return ReleaseAnalysis(
+            analysis = ReleaseAnalysis(
                 repo_name=repo_name,
                 release_tag=release_tag,
                 release_date=release_date,
@@ -143,110 +217,158 @@ Please provide input in one of these formats:
             
         except Exception as e:
             raise Exception(f"Failed to analyze release: {str(e)}")
+        
+        with self._analysis_cache_lock:
+            self._analysis_cache[cache_key] = (_monotonic(), analysis)
+            self._analysis_cache.move_to_end(cache_key)
+            if len(self._analysis_cache) > self.ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+        
+        return analysis
     
-    def _get_prs_in_release(self, repo: Repository, release_tag: str) -> List[PRInfo]:
-        """Get all PRs included in a specific release."""
-        prs = []
+    def analyze_releases(self, releases: List[Tuple[str, str]],
+                         max_concurrency: int = 8) -> List[ReleaseAnalysis]:
+        """Analyze several (repo_name, release_tag) pairs concurrently.
         
+        Results are returned in input order. max_concurrency bounds the number
+        of releases in flight, and PR fetches across all of them share
+        PR_FETCH_WORKERS slots, so at most max_concurrency + PR_FETCH_WORKERS
+        GitHub requests run at once, staying within its secondary rate limits.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            return list(executor.map(lambda pair: self.analyze_release(*pair), releases))
+    
+    def _get_prs_in_release(self, repo: Repository, release: GitRelease) -> List[PRInfo]:
+        """Get all PRs included in a specific release."""
         try:
-            # Get the release
-            release = repo.get_release(release_tag)
             target_commitish = release.target_commitish or "main"
             
-            # Get all releases to find the previous one
-            releases = list(repo.get_releases())
-            current_release_index = None
-            
-            for i, rel in enumerate(releases):
-                if rel.tag_name == release_tag:
-                    current_release_index = i
-                    break
-            
-            if current_release_index is None:
-                raise Exception(f"Release {release_tag} not found")
-            
             # Get previous release for comparison
-            previous_release = None
-            if current_release_index < len(releases) - 1:
-                previous_release = releases[current_release_index + 1]
+            previous_release = self._find_previous_release(repo, release.tag_name)
             
             # Get commits between releases
             if previous_release:
                 # Compare between previous release and current release
                 comparison = repo.compare(previous_release.tag_name, release.tag_name)
-                commits = list(comparison.commits)
+                commits = comparison.commits
             else:
                 # If no previous release, get all commits up to this release
-                commits = list(repo.get_commits(sha=target_commitish))[:50]  # Limit to recent commits
-            
-            print(f"🔍 Analyzing {len(commits)} commits...")
+                # Limit to recent commits; islice stops paginating after the first 50
+                commits = islice(repo.get_commits(sha=target_commitish), 50)
             
-            # Find PRs associated with these commits
+            # Find PRs associated with these commits, consuming the paginated
+            # list page by page rather than materializing it up front
             pr_numbers = set()
+            commit_count = 0
             for commit in commits:
+                commit_count += 1
                 # Look for PR references in commit messages
                 pr_refs = self._extract_pr_numbers_from_commit(commit)
                 pr_numbers.update(pr_refs)
             
-            # Get detailed PR information
-            for pr_number in pr_numbers:
-                try:
-                    pr = repo.get_pull(pr_number)
-                    if pr.merged:
-                        pr_info = self._extract_pr_info(pr)
-                        prs.append(pr_info)
-                except Exception as e:
-                    print(f"⚠️  Could not fetch PR #{pr_number}: {e}")
-                    continue
+            print(f"🔍 Analyzed {commit_count} commits, found {len(pr_numbers)} PR references")
+            
+            # Get detailed PR information, fetching PRs concurrently since each
+            # PR costs blocking round-trips for its details and files
+            with ThreadPoolExecutor(max_workers=self.PR_FETCH_WORKERS) as executor:
+                results = executor.map(lambda n: self._fetch_pr_info(repo, n), sorted(pr_numbers))
+                prs = [pr_info for pr_info in results if pr_info is not None]
             
             return prs
             
         except Exception as e:
             raise Exception(f"Error getting PRs for release: {str(e)}")
     
-    def _extract_pr_numbers_from_commit(self, commit: GitCommit) -> List[int]:
-        """Extract PR numbers from commit messages."""
-        import re
-        
-        pr_numbers = []
-        message = commit.commit.message
+    def _find_previous_release(self, repo: Repository, release_tag: str) -> Optional[GitRelease]:
+        """Find the release published before release_tag, or None if it is the first.
         
-        # Look for patterns like "Merge pull request #123" or "(#123)"
-        patterns = [
-            r'Merge pull request #(\d+)',
-            r'\(#(\d+)\)',
-            r'#(\d+)',
-            r'PR #(\d+)',
-            r'pull request #(\d+)'
-        ]
+        Releases are listed newest first, so the scan stops one entry past the
+        current tag instead of paging through the whole release history.
+        """
+        found = False
+        for rel in repo.get_releases():
+            if found:
+                return rel
+            if rel.tag_name == release_tag:
+                found = True
         
-        for pattern in patterns:
-            matches = re.findall(pattern, message, re.IGNORECASE)
-            for match in matches:
-                pr_numbers.append(int(match))
+        if not found:
+            raise Exception(f"Release {release_tag} not found")
+        return None
+    
+    def _fetch_pr_info(self, repo: Repository, pr_number: int) -> Optional[PRInfo]:
+        """Fetch a single PR and extract its info, or None if unmerged or unavailable."""
+        cache_key = (repo.full_name, pr_number)
+        with self._pr_cache_lock:
+            cached = self._pr_cache.get(cache_key)
+            if cached is not None:
+                self._pr_cache.move_to_end(cache_key)
+                return cached
         
-        return list(set(pr_numbers))  # Remove duplicates
+        for attempt in range(self.RATE_LIMIT_RETRIES + 1):
+            try:
+                with self._pr_fetch_slots:
+                    pr = repo.get_pull(pr_number)
+                    if not pr.merged:
+                        return None
+                    pr_info = self._extract_pr_info(pr)
+                # Only cache PRs whose file list was fully fetched, so a
+                # transient failure is retried on the next analysis
+                if pr_info.files is not None:
+                    with self._pr_cache_lock:
+                        self._pr_cache[cache_key] = pr_info
+                        if len(self._pr_cache) > self.PR_CACHE_SIZE:
+                            self._pr_cache.popitem(last=False)
+                return pr_info
+            except RateLimitExceededException as e:
+                if attempt == self.RATE_LIMIT_RETRIES:
+                    print(f"⚠️  Could not fetch PR #{pr_number}: {e}")
+                    return None
+                self._wait_for_rate_limit_reset()
+            except Exception as e:
+                print(f"⚠️  Could not fetch PR #{pr_number}: {e}")
+                return None
+        return None
+    
+    def _wait_for_rate_limit_reset(self) -> None:
+        """Sleep until GitHub's rate limit window resets, bounded by MAX_RATE_LIMIT_WAIT."""
+        try:
+            wait = self.github.rate_limiting_resettime - time.time()
+        except Exception:
+            wait = self.MAX_RATE_LIMIT_WAIT
+        wait = min(max(wait, 1), self.MAX_RATE_LIMIT_WAIT)
+        print(f"⏳ GitHub rate limit hit, retrying in {wait:.0f}s...")
+        _sleep(wait)
+    
+    def _extract_pr_numbers_from_commit(self, commit: GitCommit) -> List[int]:
+        """Extract PR numbers from commit messages."""
+        pr_numbers = {int(match) for match in _PR_NUM_RE.findall(commit.commit.message)}
+        return list(pr_numbers)
     
     def _extract_pr_info(self, pr: PullRequest) -> PRInfo:
         """Extract detailed information from a PR focusing on code changes."""
-        # Get file changes and their diffs for code analysis
-        files = []
-        file_changes = {}  # Store file changes for content analysis
         try:
-            pr_files = list(pr.get_files())
-            files = [f.filename for f in pr_files]
-            
-            # Get file changes/diffs for code analysis
-            for f in pr_files:
-                file_changes[f.filename] = {
+            # Get file changes/diffs for code analysis in a single pass over
+            # the paginated file list; the path list follows the dict's order
+            file_changes = {
+                _intern(f.filename): {
                     'status': f.status,  # 'added', 'modified', 'removed'
                     'additions': f.additions,
                     'deletions': f.deletions,
-                    'patch': f.patch if hasattr(f, 'patch') else None
+                    'patch': getattr(f, 'patch', None)
                 }
+                for f in pr.get_files()
+            }
+            files = list(file_changes)
+        except RateLimitExceededException:
+            # Let _fetch_pr_info wait for the reset and retry the whole PR
+            raise
         except Exception as e:
             print(f"⚠️  Could not fetch files for PR #{pr.number}: {e}")
-            files = []
+            files = None  # Marks the file list as incomplete
             file_changes = {}
         
         # Create PRInfo without reading PR body - focus on code only
@@ -254,61 +376,39 @@ Please provide input in one of these formats:
             number=pr.number,
             title=pr.title,
             body="",  # Don't read PR descriptions
-            author=pr.user.login,
-            labels=[label.name for label in pr.labels],
+            author=_intern(pr.user.login),
+            labels=[_intern(label.name) for label in pr.labels],
             merged_at=pr.merged_at,
             url=pr.html_url,
             commits_count=pr.commits,
             additions=pr.additions,
             deletions=pr.deletions,
             changed_files=pr.changed_files,
-            files=files
+            files=files,
+            file_changes=file_changes
         )
         
-        # Add file changes as custom attribute for code analysis
-        pr_info.file_changes = file_changes
-        
         return pr_info
     
     def _categorize_prs(self, prs: List[PRInfo]) -> Dict[str, List[PRInfo]]:
         """Categorize PRs using modular detector system."""
-        # Initialize detectors in priority order
-        detectors = [
-            NewAdaptersModulesDetector(),
-            CoreChangesDetector(is_feature=True),            # Core Features
-            CoreChangesDetector(is_feature=False),           # Core Updates
-            AdapterModuleChangesDetector(is_feature=True),   # Adapter & Module Features
-            AdapterModuleChangesDetector(is_feature=False),  # Adapter & Module Updates
-            TestingBuildDocsDetector(),
-            OtherDetector()  # Fallback
-        ]
-        
-        categories = {}
+        categories: Dict[str, List[PRInfo]] = defaultdict(list)
         
         for pr in prs:
-            categorized = False
+            # Classify the PR's files once and share the context across detectors
+            file_context = SHARED_CONTEXT_MANAGER.create_file_context(pr)
             
             # Try each detector in priority order
-            for detector in detectors:
-                result = detector.detect(pr)
+            for detector in self._DETECTORS:
+                result = detector.detect(pr, file_context)
                 if result.detected:
-                    category_name = detector.get_category_name()
-                    
-                    if category_name not in categories:
-                        categories[category_name] = []
-                    
-                    categories[category_name].append(pr)
+                    categories[detector.get_category_name()].append(pr)
                     
                     # Add detection metadata to PR for debugging/reporting
                     pr.detection_result = result
-                    
-                    categorized = True
                     break
-            
-            # Should never happen since OtherDetector always detects
-            if not categorized:
-                if "Other" not in categories:
-                    categories["Other"] = []
+            else:
+                # Should never happen since OtherDetector always detects
                 categories["Other"].append(pr)
         
         # Return categories in the specified order with emojis
@@ -337,7 +437,8 @@ Please provide input in one of these formats:
     
     def _format_analysis_response(self, analysis: ReleaseAnalysis) -> str:
         """Format the analysis results for console display with detection details."""
-        response = f"""
+        # Collect pieces in a list and join once instead of growing a string
+        parts = [f"""
 🚀 Release Analysis: {analysis.repo_name} - {analysis.release_tag}
 
 📊 Quick Stats:
@@ -346,43 +447,66 @@ Please provide input in one of these formats:
 - Categories: {len(analysis.categories)}
 
 📋 PR Breakdown:
-"""
+"""]
         
         for category, prs in analysis.categories.items():
-            response += f"\n{category} ({len(prs)} PRs):\n"
+            parts.append(f"\n{category} ({len(prs)} PRs):\n")
             
             # Display PRs with detection details
             for pr in prs:
-                pr_line = f"- #{pr.number}: {pr.title} (@{pr.author})"
+                parts.append(f"- #{pr.number}: {pr.title} (@{pr.author})")
                 
                 # Add detection metadata if available
-                if hasattr(pr, 'detection_result') and pr.detection_result.metadata:
+                if pr.detection_result is not None and pr.detection_result.metadata:
                     metadata = pr.detection_result.metadata
                     if 'type' in metadata:
-                        pr_line += f" [{metadata['type']}]"
+                        parts.append(f" [{metadata['type']}]")
                     elif 'change_type' in metadata:
-                        pr_line += f" [{metadata['change_type']}]"
+                        parts.append(f" [{metadata['change_type']}]")
                 
-                response += pr_line + "\n"
+                parts.append("\n")
         
         # Add contributors section
-        contributors = list(set(pr.author for pr in analysis.prs))
+        contributors = sorted({pr.author for pr in analysis.prs})
         if contributors:
-            response += f"\n🙏 Contributors ({len(contributors)}):\n"
-            response += f"{', '.join([f'@{contributor}' for contributor in sorted(contributors)])}\n"
+            parts.append(f"\n🙏 Contributors ({len(contributors)}):\n")
+            parts.append(f"{', '.join([f'@{contributor}' for contributor in contributors])}\n")
         
-        return response
+        return "".join(parts)
+
+
+# Shared agent for the convenience functions, created on first use so
+# repeated calls reuse one GitHub client and its connection pool.
+_AGENT: Optional[GitHubReleaseAgent] = None
+_AGENT_LOCK = threading.Lock()
+
+
+def _get_agent() -> GitHubReleaseAgent:
+    """Return the shared GitHubReleaseAgent, creating it if needed."""
+    global _AGENT
+    if _AGENT is None:
+        with _AGENT_LOCK:
+            if _AGENT is None:
+                _AGENT = GitHubReleaseAgent()
+    return _AGENT
 
 
 # Convenience functions for direct usage
 def analyze_github_release(repo_name: str, release_tag: str) -> ReleaseAnalysis:
     """Convenience function to analyze a GitHub release."""
-    agent = GitHubReleaseAgent()
+    agent = _get_agent()
     return agent.analyze_release(repo_name, release_tag)
 
 
+def analyze_github_releases(releases: List[Tuple[str, str]],
+                            max_concurrency: int = 8) -> List[ReleaseAnalysis]:
+    """Convenience function to analyze many GitHub releases concurrently."""
+    agent = _get_agent()
+    return agent.analyze_releases(releases, max_concurrency)
+
+
 def quick_release_summary(repo_name: str, release_tag: str) -> str:
     """Quick function to get a formatted release summary."""
-    agent = GitHubReleaseAgent()
+    agent = _get_agent()
     analysis = agent.analyze_release(repo_name, release_tag)
     return agent._format_analysis_response(analysis)
\ No newline at end of file
@@ -1,13 +1,19 @@
 """Prebid Release Analysis Agent - Specialized for Prebid repositories."""
 
 import os
-from typing import Optional, Dict, List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Tuple
 from dotenv import load_dotenv
 
 from agents_playground.github_release_agent import GitHubReleaseAgent, AgentConfig
 
 load_dotenv()
 
+# Clock for latest-tag expiry; a module attribute so tests can patch it without
+# touching the global time module
+_monotonic = time.monotonic
+
 
 class PrebidReleaseAgent(GitHubReleaseAgent):
     """Specialized agent for analyzing Prebid repository releases."""
@@ -20,11 +26,17 @@ class PrebidReleaseAgent(GitHubReleaseAgent):
         "android": "prebid/prebid-mobile-android"
     }
     
+    LATEST_TAG_TTL = 300  # Seconds a looked-up latest release tag stays fresh
+    
+    # Shared across instances so the convenience functions, which build a new
+    # agent per call, also reuse lookups: repo_name -> (fetched_at, tag)
+    _latest_tag_cache: Dict[str, Tuple[float, str]] = {}
+    
     def __init__(self, config: Optional[AgentConfig] = None):
         super().__init__(config or AgentConfig(
             name="PrebidReleaseAnalyzer",
             model="gemini-2.0-flash-exp",
-            temperature=0.3
+            temperature=0.0  # Analysis is rule-based; only affects future LLM calls
         ))
     
     def respond(self, message: str) -> str:
@@ -62,31 +74,94 @@ class PrebidReleaseAgent(GitHubReleaseAgent):
         return super()._parse_input(message)
     
     def _get_latest_release_tag(self, repo_name: str) -> str:
-        """Get the latest release tag for a repository."""
+        """Get the latest release tag for a repository, cached for LATEST_TAG_TTL seconds."""
+        cached = self._latest_tag_cache.get(repo_name)
+        if cached is not None and _monotonic() - cached[0] < self.LATEST_TAG_TTL:
+            return cached[1]
+        
         try:
             repo = self.github.get_repo(repo_name)
             latest_release = repo.get_latest_release()
+            self._latest_tag_cache[repo_name] = (_monotonic(), latest_release.tag_name)
             return latest_release.tag_name
         except Exception as e:
             raise ValueError(f"Could not get latest release for {repo_name}: {str(e)}")
     
+    def _get_latest_release_tags_bulk(self, repo_names: List[str]) -> Dict[str, str]:
+        """Get the latest release tags for several repositories in one GraphQL request.
+        
+        Repositories without a published release are left out of the result.
+        Tags are shared with _get_latest_release_tag's cache.
+        """
+        now = _monotonic()
+        tags: Dict[str, str] = {}
+        missing: List[str] = []
+        for repo_name in repo_names:
+            cached = self._latest_tag_cache.get(repo_name)
+            if cached is not None and now - cached[0] < self.LATEST_TAG_TTL:
+                tags[repo_name] = cached[1]
+            else:
+                missing.append(repo_name)
+        
+        if not missing:
+            return tags
+        
+        # One aliased repository() field per repo, with owner/name passed as variables
+        params = []
+        fields = []
+        variables = {}
+        for i, repo_name in enumerate(missing):
+            owner, name = repo_name.split("/", 1)
+            params.append(f"$owner{i}: String!, $name{i}: String!")
+            fields.append(f"r{i}: repository(owner: $owner{i}, name: $name{i}) {{ latestRelease {{ tagName }} }}")
+            variables[f"owner{i}"] = owner
+            variables[f"name{i}"] = name
+        query = f"query({', '.join(params)}) {{ {' '.join(fields)} }}"
+        
+        try:
+            _, response = self.github.requester.graphql_query(query, variables)
+        except Exception as e:
+            raise ValueError(f"Could not get latest releases for {', '.join(missing)}: {str(e)}")
+        
+        fetched_at = _monotonic()
+        data = response.get("data") or {}
+        for i, repo_name in enumerate(missing):
+            latest_release = (data.get(f"r{i}") or {}).get("latestRelease")
+            if latest_release:
+                tags[repo_name] = latest_release["tagName"]
+                self._latest_tag_cache[repo_name] = (fetched_at, tags[repo_name])
+        
+        return tags
+    
+    def _latest_tag_or_unknown(self, repo_name: str) -> str:
+        """Get the latest release tag, or 'unknown' if it can't be fetched."""
+        try:
+            return self._get_latest_release_tag(repo_name)
+        except Exception:
+            return "unknown"
+    
     def list_prebid_repos(self) -> str:
         """List available Prebid repository shortcuts."""
-        result = "🏗️ **Available Prebid Repository Shortcuts:**\n\n"
+        parts = ["🏗️ **Available Prebid Repository Shortcuts:**\n\n"]
+        
+        repo_names = list(self.PREBID_REPOS.values())
+        try:
+            # One GraphQL round trip for every repo's latest tag
+            latest_tags = self._get_latest_release_tags_bulk(repo_names)
+        except Exception:
+            # Fall back to concurrent per-repo REST lookups
+            with ThreadPoolExecutor(max_workers=len(repo_names)) as executor:
+                latest_tags = dict(zip(repo_names, executor.map(self._latest_tag_or_unknown, repo_names)))
         
         for shortcut, repo in self.PREBID_REPOS.items():
-            try:
-                latest_tag = self._get_latest_release_tag(repo)
-                result += f"- **{shortcut}**: {repo} (latest: {latest_tag})\n"
-            except Exception:
-                result += f"- **{shortcut}**: {repo} (latest: unknown)\n"
-        
-        result += "\n**Usage Examples:**\n"
-        result += "- `js` - Analyze latest Prebid.js release\n"
-        result += "- `server-go:v3.18.0` - Analyze specific prebid-server release\n"
-        result += "- `ios v2.1.0` - Analyze specific iOS release\n"
-        
-        return result
+            parts.append(f"- **{shortcut}**: {repo} (latest: {latest_tags.get(repo, 'unknown')})\n")
+        
+        parts.append("\n**Usage Examples:**\n")
+        parts.append("- `js` - Analyze latest Prebid.js release\n")
+        parts.append("- `server-go:v3.18.0` - Analyze specific prebid-server release\n")
+        parts.append("- `ios v2.1.0` - Analyze specific iOS release\n")
+        
+        return "".join(parts)
     
     def analyze_latest(self, repo_shortcut: str) -> str:
         """Analyze the latest release of a Prebid repository."""
@@ -113,7 +188,7 @@ class PrebidReleaseAgent(GitHubReleaseAgent):
     
     def _format_comparison(self, analysis1, analysis2) -> str:
         """Format a comparison between two releases."""
-        result = f"""
+        header = f"""
 🔄 **Release Comparison: {analysis1.repo_name}**
 
 📊 **{analysis1.release_tag} vs {analysis2.release_tag}**
@@ -124,14 +199,15 @@ class PrebidReleaseAgent(GitHubReleaseAgent):
 
 **{analysis1.release_tag} Categories:**
 """
+        parts = [header]
         for category, prs in analysis1.categories.items():
-            result += f"- {category}: {len(prs)} PRs\n"
+            parts.append(f"- {category}: {len(prs)} PRs\n")
         
-        result += f"\n**{analysis2.release_tag} Categories:**\n"
+        parts.append(f"\n**{analysis2.release_tag} Categories:**\n")
         for category, prs in analysis2.categories.items():
-            result += f"- {category}: {len(prs)} PRs\n"
+            parts.append(f"- {category}: {len(prs)} PRs\n")
         
-        return result
+        return "".join(parts)
 
 
 # Convenience functions for direct usage
@@ -0,0 +1,52 @@
+"""Shared pytest configuration and fixtures."""
+
+import os
+
+import pytest
+import requests
+
+from agents_playground.github_release_agent import GitHubReleaseAgent
+from agents_playground.prebid_agent import PrebidReleaseAgent
+
+
+@pytest.fixture(scope="session")
+def github_token():
+    """GITHUB_TOKEN from the environment; skips the requesting test when missing."""
+    token = os.getenv("GITHUB_TOKEN")
+    if not token:
+        pytest.skip("GITHUB_TOKEN not available")
+    return token
+
+
+@pytest.fixture(scope="session")
+def github_session():
+    """One keep-alive HTTP session for the live GitHub API tests, closed at teardown."""
+    with requests.Session() as session:
+        yield session
+
+
+@pytest.fixture(scope="session")
+def prebid_agent():
+    """One PrebidReleaseAgent shared by the whole session.
+
+    Tests that change its state should do so through monkeypatch.
+    """
+    return PrebidReleaseAgent()
+
+
+@pytest.fixture(scope="session")
+def release_agent():
+    """One GitHubReleaseAgent shared by the whole session.
+
+    Tests that change its state should do so through monkeypatch.
+    """
+    return GitHubReleaseAgent()
+
+
+@pytest.fixture(scope="session")
+def prebid_latest_tags(github_token, prebid_agent):
+    """Latest release tag of every Prebid repo, fetched in one GitHub request per session.
+
+    github_token is requested first so a missing token skips before the agent is built.
+    """
+    return prebid_agent._get_latest_release_tags_bulk(list(prebid_agent.PREBID_REPOS.values()))
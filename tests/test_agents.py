@@ -1,7 +1,8 @@
 """Tests for agent functionality."""
 
 import pytest
-from agents_playground.agents import SimpleAgent, AgentConfig
+from unittest.mock import patch
+from agents_playground.agents import GeminiAgent, SimpleAgent, AgentConfig
 
 
 def test_simple_agent():
@@ -26,4 +27,97 @@ def test_agent_config_defaults():
     assert config.name == "Agent"
     assert config.model == "gpt-3.5-turbo"
     assert config.temperature == 0.7
-    assert config.max_tokens is None
\ No newline at end of file
+    assert config.max_tokens is None
+
+
+def test_gemini_agent_caches_deterministic_responses(monkeypatch):
+    """Test that identical prompts at temperature 0 reuse the cached response."""
+    monkeypatch.setenv("GOOGLE_API_KEY", "dummy")
+    with patch("agents_playground.agents.genai") as mock_genai:
+        model = mock_genai.GenerativeModel.return_value
+        model.generate_content.return_value.text = "cached answer"
+        
+        agent = GeminiAgent(AgentConfig(temperature=0.0))
+        assert agent.respond("same prompt") == "cached answer"
+        assert agent.respond("same prompt") == "cached answer"
+        assert model.generate_content.call_count == 1
+        
+        # A different output limit can produce a different response
+        agent.config.max_tokens = 5
+        agent.respond("same prompt")
+        assert model.generate_content.call_count == 2
+        
+        agent.config.temperature = 0.7
+        agent.respond("same prompt")
+        assert model.generate_content.call_count == 3
+
+
+def test_gemini_agent_response_cache_is_bounded(monkeypatch):
+    """Test that the response cache evicts the least recently used prompt."""
+    monkeypatch.setenv("GOOGLE_API_KEY", "dummy")
+    with patch("agents_playground.agents.genai") as mock_genai:
+        model = mock_genai.GenerativeModel.return_value
+        model.generate_content.return_value.text = "answer"
+        
+        agent = GeminiAgent(AgentConfig(temperature=0.0))
+        agent.RESPONSE_CACHE_SIZE = 2
+        for prompt in ("a", "b", "a", "c"):
+            agent.respond(prompt)
+        
+        assert len(agent._response_cache) == 2
+        agent.respond("a")
+        assert model.generate_content.call_count == 3
+        agent.respond("b")
+        assert model.generate_content.call_count == 4
+
+
+class _FakeChunk:
+    """Streamed response chunk; .text raises without parts, like the SDK's."""
+    
+    def __init__(self, text=None):
+        self.parts = [text] if text is not None else []
+        self._text = text
+    
+    @property
+    def text(self):
+        if not self.parts:
+            raise ValueError("chunk has no parts")
+        return self._text
+
+
+def test_gemini_agent_streams_chunks_and_skips_empty_ones(monkeypatch):
+    """Test that streaming yields each text chunk and skips chunks without parts."""
+    monkeypatch.setenv("GOOGLE_API_KEY", "dummy")
+    with patch("agents_playground.agents.genai") as mock_genai:
+        model = mock_genai.GenerativeModel.return_value
+        model.generate_content.return_value = iter([
+            _FakeChunk("Hello"), _FakeChunk(), _FakeChunk(", world"), _FakeChunk()
+        ])
+        
+        agent = GeminiAgent(AgentConfig())
+        assert list(agent.respond_stream("hi")) == ["Hello", ", world"]
+        assert model.generate_content.call_args.kwargs["stream"] is True
+
+
+def test_gemini_agent_enforces_input_token_budget(monkeypatch):
+    """Test that prompts over max_input_tokens are rejected before generation."""
+    monkeypatch.setenv("GOOGLE_API_KEY", "dummy")
+    with patch("agents_playground.agents.genai") as mock_genai:
+        model = mock_genai.GenerativeModel.return_value
+        model.generate_content.return_value.text = "answer"
+        
+        agent = GeminiAgent(AgentConfig(max_input_tokens=10))
+        
+        model.count_tokens.return_value.total_tokens = 10
+        assert agent.respond("short prompt") == "answer"
+        
+        model.count_tokens.return_value.total_tokens = 11
+        response = agent.respond("long prompt")
+        assert "over the 10 token input budget" in response
+        assert model.generate_content.call_count == 1
+        
+        # Without a budget no count_tokens round trip is made
+        agent.config.max_input_tokens = None
+        model.count_tokens.reset_mock()
+        agent.respond("any prompt")
+        model.count_tokens.assert_not_called()
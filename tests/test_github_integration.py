@@ -5,31 +5,24 @@ import pytest
 import requests
 from dotenv import load_dotenv
 
+pytestmark = [pytest.mark.integration, pytest.mark.xdist_group(name="network")]
 
-def test_github_token_loaded():
+
+def test_github_token_loaded(github_token):
     """Test that GITHUB_TOKEN is loaded from environment."""
-    load_dotenv()
-    token = os.getenv("GITHUB_TOKEN")
-    assert token is not None, "GITHUB_TOKEN should be set in .env file"
-    assert len(token.strip()) > 0, "GITHUB_TOKEN should not be empty"
+    assert len(github_token.strip()) > 0, "GITHUB_TOKEN should not be empty"
 
 
-def test_github_api_authentication():
+def test_github_api_authentication(github_token, github_session):
     """Test GitHub API authentication with the token."""
-    load_dotenv()
-    token = os.getenv("GITHUB_TOKEN")
-    
-    if not token:
-        pytest.skip("GITHUB_TOKEN not found in environment")
-    
     # Test GitHub API authentication
     headers = {
-        "Authorization": f"Bearer {token}",
+        "Authorization": f"Bearer {github_token}",
         "Accept": "application/vnd.github.v3+json"
     }
     
     # Make a simple API call to get authenticated user info
-    response = requests.get("https://api.github.com/user", headers=headers)
+    response = github_session.get("https://api.github.com/user", headers=headers)
     
     assert response.status_code == 200, f"GitHub API authentication failed: {response.status_code}"
     
@@ -40,21 +33,15 @@ def test_github_api_authentication():
     print(f"✅ GitHub API authentication successful for user: {user_data.get('login')}")
 
 
-def test_github_repo_access():
+def test_github_repo_access(github_token, github_session):
     """Test access to GitHub repositories."""
-    load_dotenv()
-    token = os.getenv("GITHUB_TOKEN")
-    
-    if not token:
-        pytest.skip("GITHUB_TOKEN not found in environment")
-    
     headers = {
-        "Authorization": f"Bearer {token}",
+        "Authorization": f"Bearer {github_token}",
         "Accept": "application/vnd.github.v3+json"
     }
     
     # Test access to user's repositories
-    response = requests.get("https://api.github.com/user/repos", headers=headers)
+    response = github_session.get("https://api.github.com/user/repos", headers=headers)
     
     assert response.status_code == 200, f"GitHub repos API failed: {response.status_code}"
     
@@ -64,22 +51,16 @@ def test_github_repo_access():
     print(f"✅ GitHub repos access successful. Found {len(repos)} repositories")
 
 
-def test_github_token_scopes():
+def test_github_token_scopes(github_token, github_session):
     """Test GitHub token scopes and permissions."""
-    load_dotenv()
-    token = os.getenv("GITHUB_TOKEN")
-    
-    if not token:
-        pytest.skip("GITHUB_TOKEN not found in environment")
-    
     # Use Bearer authentication for better compatibility
     headers = {
-        "Authorization": f"Bearer {token}",
+        "Authorization": f"Bearer {github_token}",
         "Accept": "application/vnd.github.v3+json"
     }
     
     # Make a request to check token scopes
-    response = requests.get("https://api.github.com/user", headers=headers)
+    response = github_session.get("https://api.github.com/user", headers=headers)
     
     if response.status_code == 200:
         # Check the X-OAuth-Scopes header for token permissions
@@ -99,9 +80,13 @@ def test_github_token_scopes():
 
 
 if __name__ == "__main__":
-    # Run tests directly
-    test_github_token_loaded()
-    test_github_api_authentication()
-    test_github_repo_access()
-    test_github_token_scopes()
+    # Run tests directly (without pytest, so no conftest fixtures)
+    load_dotenv()
+    token = os.getenv("GITHUB_TOKEN")
+    assert token, "GITHUB_TOKEN should be set in .env file"
+    test_github_token_loaded(token)
+    with requests.Session() as session:
+        test_github_api_authentication(token, session)
+        test_github_repo_access(token, session)
+        test_github_token_scopes(token, session)
     print("🎉 All GitHub integration tests passed!")
\ No newline at end of file
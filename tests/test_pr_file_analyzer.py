@@ -39,7 +39,8 @@ class MockGitHubPR:
         self._files = files
     
     def get_files(self):
-        return iter(self._files)
+        # A list, like PyGithub's PaginatedList, can be iterated more than once
+        return list(self._files)
 
 
 class TestPRFileAnalyzer:
@@ -277,5 +278,18 @@ class TestPRFileAnalyzer:
         assert summary["doc"]["modified"] == 1
 
 
+def test_categorization_is_cached_by_path():
+    """Test that repeated paths are classified once per analyzer."""
+    analyzer = PRFileAnalyzer('javascript')
+    github_pr = MockGitHubPR([MockGitHubFile("package.json", "modified", 3, 1)])
+    
+    analyzer.classifier = Mock(wraps=analyzer.classifier)
+    first = analyzer.analyze_pr(github_pr, 'github_api')
+    second = analyzer.analyze_pr(github_pr, 'github_api')
+    
+    assert first[0].category == second[0].category == "build"
+    assert analyzer.classifier.classify_file.call_count == 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -1,12 +1,29 @@
 """Tests for Prebid Release Analysis Agent."""
 
 import pytest
+from dataclasses import dataclass
 from unittest.mock import Mock, patch
-from dotenv import load_dotenv
 
+from agents_playground import prebid_agent as prebid_mod
 from agents_playground.prebid_agent import PrebidReleaseAgent
 
-load_dotenv()
+
+@dataclass
+class _FakeAnalysis:
+    """The ReleaseAnalysis fields read when formatting a comparison."""
+    repo_name: str
+    release_tag: str
+    total_prs: int
+    categories: dict
+
+
+@pytest.fixture
+def agent_with_latest(prebid_agent, monkeypatch):
+    """The shared agent with latest-release lookups stubbed to v8.0.0."""
+    monkeypatch.setattr(prebid_agent, "_get_latest_release_tag", lambda repo_name: "v8.0.0")
+    monkeypatch.setattr(prebid_agent, "_get_latest_release_tags_bulk",
+                        lambda repo_names: dict.fromkeys(repo_names, "v8.0.0"))
+    return prebid_agent
 
 
 def test_prebid_agent_initialization():
@@ -18,10 +35,8 @@ def test_prebid_agent_initialization():
     assert "server-go" in agent.PREBID_REPOS
 
 
-def test_prebid_repo_shortcuts():
+def test_prebid_repo_shortcuts(prebid_agent):
     """Test Prebid repository shortcuts mapping."""
-    agent = PrebidReleaseAgent()
-    
     expected_repos = {
         "js": "prebid/Prebid.js",
         "server-go": "prebid/prebid-server", 
@@ -30,153 +45,162 @@ def test_prebid_repo_shortcuts():
         "android": "prebid/prebid-mobile-android"
     }
     
-    assert agent.PREBID_REPOS == expected_repos
+    assert prebid_agent.PREBID_REPOS == expected_repos
 
 
-def test_prebid_input_parsing():
+@pytest.mark.parametrize("raw,expected_repo,expected_tag", [
+    ("js", "prebid/Prebid.js", "v8.0.0"),                      # shortcut only (latest)
+    ("server-go:v3.18.0", "prebid/prebid-server", "v3.18.0"),  # colon format
+    ("ios v2.1.0", "prebid/prebid-mobile-ios", "v2.1.0"),      # space format
+])
+def test_prebid_input_parsing(agent_with_latest, raw, expected_repo, expected_tag):
     """Test parsing of Prebid-specific input formats."""
-    agent = PrebidReleaseAgent()
-    
-    # Mock the latest release fetching
-    with patch.object(agent, '_get_latest_release_tag') as mock_latest:
-        mock_latest.return_value = "v8.0.0"
-        
-        # Test shortcut only (should get latest)
-        repo, tag = agent._parse_prebid_input("js")
-        assert repo == "prebid/Prebid.js"
-        assert tag == "v8.0.0"
-    
-    # Test shortcut with colon format
-    repo, tag = agent._parse_prebid_input("server-go:v3.18.0")
-    assert repo == "prebid/prebid-server"
-    assert tag == "v3.18.0"
-    
-    # Test shortcut with space format
-    repo, tag = agent._parse_prebid_input("ios v2.1.0")
-    assert repo == "prebid/prebid-mobile-ios"
-    assert tag == "v2.1.0"
+    repo, tag = agent_with_latest._parse_prebid_input(raw)
+    assert repo == expected_repo
+    assert tag == expected_tag
 
 
-def test_invalid_shortcut():
+def test_invalid_shortcut(prebid_agent):
     """Test handling of invalid shortcuts."""
-    agent = PrebidReleaseAgent()
-    
     with pytest.raises(ValueError):
-        agent._parse_prebid_input("invalid_shortcut")
+        prebid_agent._parse_prebid_input("invalid_shortcut")
 
 
-def test_list_prebid_repos():
+def test_list_prebid_repos(agent_with_latest):
     """Test listing of Prebid repositories."""
-    agent = PrebidReleaseAgent()
+    result = agent_with_latest.list_prebid_repos()
     
-    with patch.object(agent, '_get_latest_release_tag') as mock_latest:
-        mock_latest.return_value = "v1.0.0"
-        
-        result = agent.list_prebid_repos()
-        
-        assert "Available Prebid Repository Shortcuts" in result
-        assert "js" in result
-        assert "server-go" in result
-        assert "Usage Examples" in result
+    assert "Available Prebid Repository Shortcuts" in result
+    assert "js" in result
+    assert "server-go" in result
+    assert "Usage Examples" in result
 
 
-def test_analyze_latest():
+def test_analyze_latest(prebid_agent):
     """Test analyzing latest release."""
-    agent = PrebidReleaseAgent()
-    
     # Test invalid shortcut
-    result = agent.analyze_latest("invalid")
+    result = prebid_agent.analyze_latest("invalid")
     assert "Unknown repository shortcut" in result
     
     # Test valid shortcut (mock the actual analysis)
-    with patch.object(agent, 'respond') as mock_respond:
+    with patch.object(prebid_agent, 'respond') as mock_respond:
         mock_respond.return_value = "Mocked analysis"
         
-        result = agent.analyze_latest("js")
+        result = prebid_agent.analyze_latest("js")
         assert result == "Mocked analysis"
         mock_respond.assert_called_once_with("js")
 
 
-def test_compare_releases():
+def test_compare_releases(prebid_agent):
     """Test release comparison functionality."""
-    agent = PrebidReleaseAgent()
-    
     # Test invalid shortcut
-    result = agent.compare_releases("invalid", "v1.0.0", "v2.0.0")
+    result = prebid_agent.compare_releases("invalid", "v1.0.0", "v2.0.0")
     assert "Unknown repository shortcut" in result
     
     # Test valid comparison (mock the analysis)
-    with patch.object(agent, 'analyze_release') as mock_analyze:
-        mock_analysis1 = Mock()
-        mock_analysis1.repo_name = "prebid/Prebid.js"
-        mock_analysis1.release_tag = "v7.0.0"
-        mock_analysis1.total_prs = 10
-        mock_analysis1.categories = {"Features": [], "Bug Fixes": []}
-        
-        mock_analysis2 = Mock()
-        mock_analysis2.repo_name = "prebid/Prebid.js"
-        mock_analysis2.release_tag = "v8.0.0"
-        mock_analysis2.total_prs = 15
-        mock_analysis2.categories = {"Features": [], "Bug Fixes": [], "Tests": []}
+    with patch.object(prebid_agent, 'analyze_release') as mock_analyze:
+        mock_analyze.side_effect = [
+            _FakeAnalysis("prebid/Prebid.js", "v7.0.0", 10, {"Features": [], "Bug Fixes": []}),
+            _FakeAnalysis("prebid/Prebid.js", "v8.0.0", 15, {"Features": [], "Bug Fixes": [], "Tests": []})
+        ]
         
-        mock_analyze.side_effect = [mock_analysis1, mock_analysis2]
-        
-        result = agent.compare_releases("js", "v7.0.0", "v8.0.0")
+        result = prebid_agent.compare_releases("js", "v7.0.0", "v8.0.0")
         
         assert "Release Comparison" in result
         assert "v7.0.0 vs v8.0.0" in result
         assert "10 vs 15 (+5)" in result
 
 
-@pytest.mark.integration
-def test_real_prebid_integration():
-    """Integration test with real Prebid repositories."""
-    import os
+def test_latest_release_tag_is_cached(prebid_agent, monkeypatch):
+    """Test that latest release lookups are reused until the TTL expires."""
+    monkeypatch.setattr(prebid_agent, "github", Mock())
+    prebid_agent.github.get_repo.return_value.get_latest_release.return_value.tag_name = "v9.0.0"
     
-    if not os.getenv("GITHUB_TOKEN"):
-        pytest.skip("GITHUB_TOKEN not available for integration test")
+    monkeypatch.setattr(prebid_mod, "_monotonic", lambda: 1000.0)
     
-    agent = PrebidReleaseAgent()
+    with patch.dict(PrebidReleaseAgent._latest_tag_cache, clear=True):
+        assert prebid_agent._get_latest_release_tag("prebid/Prebid.js") == "v9.0.0"
+        assert prebid_agent._get_latest_release_tag("prebid/Prebid.js") == "v9.0.0"
+        assert prebid_agent.github.get_repo.call_count == 1
+        
+        monkeypatch.setattr(prebid_mod, "_monotonic", lambda: 1000.0 + prebid_agent.LATEST_TAG_TTL)
+        prebid_agent._get_latest_release_tag("prebid/Prebid.js")
+        assert prebid_agent.github.get_repo.call_count == 2
+
+
+def test_latest_release_tags_bulk(prebid_agent, monkeypatch):
+    """Test that bulk latest-tag lookups use one GraphQL request and share the cache."""
+    monkeypatch.setattr(prebid_agent, "github", Mock())
+    prebid_agent.github.requester.graphql_query.return_value = ({}, {"data": {
+        "r0": {"latestRelease": {"tagName": "v9.0.0"}},
+        "r1": {"latestRelease": None}
+    }})
+    
+    with patch.dict(PrebidReleaseAgent._latest_tag_cache, clear=True):
+        repos = ["prebid/Prebid.js", "prebid/prebid-server"]
+        assert prebid_agent._get_latest_release_tags_bulk(repos) == {"prebid/Prebid.js": "v9.0.0"}
+        
+        query, variables = prebid_agent.github.requester.graphql_query.call_args.args
+        assert variables == {"owner0": "prebid", "name0": "Prebid.js", "owner1": "prebid", "name1": "prebid-server"}
+        
+        # The fetched tag is served from the shared cache afterwards
+        assert prebid_agent._get_latest_release_tag("prebid/Prebid.js") == "v9.0.0"
+        prebid_agent.github.get_repo.assert_not_called()
     
-    # Test getting latest release tag (should not fail)
-    try:
-        latest_tag = agent._get_latest_release_tag("prebid/prebid-server")
-        assert latest_tag is not None
-        assert len(latest_tag) > 0
-    except Exception as e:
-        pytest.fail(f"Failed to get latest release: {e}")
+    assert prebid_agent.github.requester.graphql_query.call_count == 1
 
 
-def test_convenience_functions():
+@pytest.mark.integration
+@pytest.mark.xdist_group(name="network")
+def test_real_prebid_integration(github_token, prebid_agent):
+    """Integration test with real Prebid repositories."""
+    # Bypass the shared tag cache so the lookup really reaches GitHub
+    with patch.dict(PrebidReleaseAgent._latest_tag_cache, clear=True):
+        latest_tag = prebid_agent._get_latest_release_tag("prebid/prebid-server")
+    assert latest_tag is not None
+    assert len(latest_tag) > 0
+
+
+@pytest.mark.integration
+@pytest.mark.xdist_group(name="network")
+def test_real_prebid_latest_tags_bulk(prebid_latest_tags):
+    """Integration test: one bulk lookup returns a tag for every Prebid repo."""
+    for repo_name in PrebidReleaseAgent.PREBID_REPOS.values():
+        latest_tag = prebid_latest_tags.get(repo_name)
+        assert latest_tag, f"No latest tag for {repo_name}"
+
+
+@pytest.fixture
+def fake_agent(monkeypatch):
+    """Make the convenience functions build a single Mock agent instead of a real one."""
+    fake = Mock()
+    monkeypatch.setattr(prebid_mod, "PrebidReleaseAgent", lambda *args, **kwargs: fake)
+    return fake
+
+
+def test_convenience_functions(fake_agent):
     """Test convenience functions."""
-    from agents_playground.prebid_agent import analyze_prebid_latest, list_prebid_repos, analyze_prebid_release
+    # Test analyze_prebid_latest
+    fake_agent.analyze_latest.return_value = "Latest analysis"
+    result = prebid_mod.analyze_prebid_latest("js")
+    assert result == "Latest analysis"
     
-    # Mock the actual analysis to avoid API calls
-    with patch('agents_playground.prebid_agent.PrebidReleaseAgent') as mock_agent_class:
-        mock_agent = Mock()
-        mock_agent_class.return_value = mock_agent
-        
-        # Test analyze_prebid_latest
-        mock_agent.analyze_latest.return_value = "Latest analysis"
-        result = analyze_prebid_latest("js")
-        assert result == "Latest analysis"
-        
-        # Test list_prebid_repos
-        mock_agent.list_prebid_repos.return_value = "Repo list"
-        result = list_prebid_repos()
-        assert result == "Repo list"
-        
-        # Test analyze_prebid_release with tag
-        mock_agent.respond.return_value = "Analysis with tag"
-        result = analyze_prebid_release("server", "v3.18.0")
-        assert result == "Analysis with tag"
-        mock_agent.respond.assert_called_with("server:v3.18.0")
-        
-        # Test analyze_prebid_release without tag
-        mock_agent.respond.return_value = "Analysis without tag"
-        result = analyze_prebid_release("js")
-        assert result == "Analysis without tag"
-        mock_agent.respond.assert_called_with("js")
+    # Test list_prebid_repos
+    fake_agent.list_prebid_repos.return_value = "Repo list"
+    result = prebid_mod.list_prebid_repos()
+    assert result == "Repo list"
+    
+    # Test analyze_prebid_release with tag
+    fake_agent.respond.return_value = "Analysis with tag"
+    result = prebid_mod.analyze_prebid_release("server", "v3.18.0")
+    assert result == "Analysis with tag"
+    fake_agent.respond.assert_called_with("server:v3.18.0")
+    
+    # Test analyze_prebid_release without tag
+    fake_agent.respond.return_value = "Analysis without tag"
+    result = prebid_mod.analyze_prebid_release("js")
+    assert result == "Analysis without tag"
+    fake_agent.respond.assert_called_with("js")
 
 
 if __name__ == "__main__":
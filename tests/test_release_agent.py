@@ -1,12 +1,57 @@
 """Tests for GitHub Release Analysis Agent."""
 
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from types import SimpleNamespace
+
 import pytest
 from unittest.mock import Mock, patch
-from dotenv import load_dotenv
 
+from agents_playground import github_release_agent
 from agents_playground.github_release_agent import GitHubReleaseAgent, PRInfo
 
-load_dotenv()
+
+def _sample_pr(number, title, labels, file_changes):
+    """Build a merged PR whose files drive the detectors."""
+    return PRInfo(
+        number, title, "", f"user{number}", labels, None, "", 1,
+        len(file_changes), 0, len(file_changes),
+        files=list(file_changes), file_changes=file_changes
+    )
+
+
+def _change(status="modified", patch=None):
+    """One file_changes entry as _extract_pr_info builds it."""
+    return {'status': status, 'additions': 1, 'deletions': 0, 'patch': patch}
+
+
+# Sample input for the categorization tests, one PR per category. _categorize_prs
+# sets detection_result on the PRs it sees, so each case categorizes a copy.
+_SAMPLE_PRS: tuple[PRInfo, ...] = (
+    _sample_pr(1, "Add example bid adapter", ["feature"], {
+        "modules/exampleBidAdapter.js": _change("added"),
+    }),
+    _sample_pr(2, "Fix exchange timeout", ["bug"], {
+        "exchange/exchange.go": _change(),
+    }),
+    _sample_pr(3, "Add example adapter helpers", ["feature"], {
+        "modules/exampleBidAdapter.js": _change(),
+        "modules/exampleUtils.js": _change("added"),
+        "modules/exampleHelpers.js": _change("added"),
+    }),
+    _sample_pr(4, "fix: example adapter sizes", ["bug"], {
+        "modules/exampleBidAdapter.js": _change(),
+    }),
+    _sample_pr(5, "Add exchange unit tests", ["test"], {
+        "exchange/exchange_test.go": _change(),
+    }),
+    _sample_pr(6, "Bump version", [], {}),
+)
+
+_LABELS = (SimpleNamespace(name="bug"), SimpleNamespace(name="urgent"))
 
 
 def test_release_agent_initialization():
@@ -39,83 +84,102 @@ def test_pr_info_dataclass():
     assert len(pr_info.labels) == 2
 
 
-def test_categorize_prs():
+@pytest.mark.parametrize("number,expected_category", [
+    (1, "🔮 New Adapters & Modules"),
+    (2, "💻 Core Updates"),
+    (3, "⚡ Adapter & Module Features"),
+    (4, "🔨 Adapter & Module Updates"),
+    (5, "🧪 Testing / Build Process / Docs Updates"),
+    (6, "🛸 Other"),
+])
+def test_categorize_prs(release_agent, number, expected_category):
     """Test PR categorization logic."""
-    agent = GitHubReleaseAgent()
-    
-    prs = [
-        PRInfo(1, "feat: Add new feature", "", "user1", ["feature"], None, "", 1, 10, 0, 1),
-        PRInfo(2, "fix: Bug fix", "", "user2", ["bug"], None, "", 1, 5, 2, 1),
-        PRInfo(3, "docs: Update README", "", "user3", ["documentation"], None, "", 1, 3, 0, 1),
-        PRInfo(4, "refactor: Code cleanup", "", "user4", [], None, "", 1, 0, 5, 2),
-        PRInfo(5, "Add unit tests", "", "user5", ["test"], None, "", 1, 15, 0, 3),
-    ]
+    pr = replace(_SAMPLE_PRS[number - 1])
     
-    categories = agent._categorize_prs(prs)
+    categories = release_agent._categorize_prs([pr])
     
-    # Check that categorization works correctly
-    assert "Features" in categories
-    assert "Bug Fixes" in categories  
-    assert "Documentation" in categories
-    assert "Refactoring" in categories
-    assert "Tests" in categories
+    assert expected_category in categories
+    assert categories[expected_category] == [pr]
+
+
+def test_categorize_core_feature(release_agent):
+    """Core PRs that add more files than they modify are core features."""
+    pr = _sample_pr(7, "Add first-party data enrichment", ["feature"], {
+        "src/fpd/enrichment.js": _change("added"),
+        "src/fpd/sua.js": _change("added"),
+        "modules/exampleBidAdapter.js": _change(),
+    })
     
-    # Verify specific categorizations
-    feature_pr = next(pr for pr in categories["Features"] if pr.number == 1)
-    assert feature_pr.title == "feat: Add new feature"
+    categories = release_agent._categorize_prs([pr])
     
-    bug_pr = next(pr for pr in categories["Bug Fixes"] if pr.number == 2)
-    assert bug_pr.title == "fix: Bug fix"
+    assert categories["🦠 Core Features"] == [pr]
 
 
-def test_extract_pr_numbers_from_commit():
+def test_extract_pr_numbers_from_commit(release_agent):
     """Test PR number extraction from commit messages."""
-    agent = GitHubReleaseAgent()
+    # Fake commit object
+    mock_commit = SimpleNamespace(commit=SimpleNamespace(message="Merge pull request #123 from user/branch"))
     
-    # Mock commit object
-    mock_commit = Mock()
-    mock_commit.commit.message = "Merge pull request #123 from user/branch"
-    
-    pr_numbers = agent._extract_pr_numbers_from_commit(mock_commit)
+    pr_numbers = release_agent._extract_pr_numbers_from_commit(mock_commit)
     assert 123 in pr_numbers
     
     # Test different patterns
     mock_commit.commit.message = "Fix issue (#456) and resolve PR #789"
-    pr_numbers = agent._extract_pr_numbers_from_commit(mock_commit)
+    pr_numbers = release_agent._extract_pr_numbers_from_commit(mock_commit)
     assert 456 in pr_numbers
     assert 789 in pr_numbers
+    
+    mock_commit.commit.message = "Backport pull request #321"
+    assert release_agent._extract_pr_numbers_from_commit(mock_commit) == [321]
+    
+    # A PR referenced twice is only reported once
+    mock_commit.commit.message = "Revert PR #55 (#55)"
+    assert release_agent._extract_pr_numbers_from_commit(mock_commit) == [55]
 
 
-def test_respond_format_validation():
-    """Test the respond method input format validation."""
-    agent = GitHubReleaseAgent()
+def test_find_previous_release(release_agent):
+    """Test previous-release lookup stops scanning after the current tag."""
+    def releases():
+        for tag in ["v3.0.0", "v2.0.0", "v1.0.0"]:
+            release = Mock()
+            release.tag_name = tag
+            yield release
+        pytest.fail("release scan should stop after the previous release")
+    
+    mock_repo = Mock()
+    mock_repo.get_releases.side_effect = releases
     
+    assert release_agent._find_previous_release(mock_repo, "v3.0.0").tag_name == "v2.0.0"
+    assert release_agent._find_previous_release(mock_repo, "v2.0.0").tag_name == "v1.0.0"
+    
+    mock_repo.get_releases.side_effect = None
+    mock_repo.get_releases.return_value = []
+    with pytest.raises(Exception, match="not found"):
+        release_agent._find_previous_release(mock_repo, "v9.9.9")
+
+
+def test_respond_format_validation(release_agent):
+    """Test the respond method input format validation."""
     # Test invalid format
-    response = agent.respond("invalid-format")
+    response = release_agent.respond("invalid-format")
     assert "Please provide input in format" in response
     
     # Test valid format (will fail at API level but format is correct)
-    with patch.object(agent, 'analyze_release') as mock_analyze:
+    with patch.object(release_agent, 'analyze_release') as mock_analyze:
         mock_analyze.side_effect = Exception("API Error")
-        response = agent.respond("owner/repo:v1.0.0")
+        response = release_agent.respond("owner/repo:v1.0.0")
         assert "Error analyzing release" in response
 
 
 @pytest.mark.integration
-def test_real_github_integration():
+@pytest.mark.xdist_group(name="network")
+def test_real_github_integration(github_token, release_agent):
     """Integration test with real GitHub API (requires GITHUB_TOKEN)."""
-    import os
-    
-    if not os.getenv("GITHUB_TOKEN"):
-        pytest.skip("GITHUB_TOKEN not available for integration test")
-    
-    agent = GitHubReleaseAgent()
-    
     # Test with a small, known repository and release
     # Using a public repo with a known release
     try:
         # Test format validation first
-        response = agent.respond("octocat/Hello-World:test")
+        response = release_agent.respond("octocat/Hello-World:test")
         # Should either succeed or fail gracefully
         assert len(response) > 0
     except Exception as e:
@@ -123,32 +187,213 @@ def test_real_github_integration():
         assert "Error analyzing release" in str(e) or "not found" in str(e).lower()
 
 
-def test_pr_info_extraction():
+def test_pr_info_extraction(release_agent):
     """Test PR information extraction logic."""
-    agent = GitHubReleaseAgent()
+    # Fake PR object
+    mock_pr = SimpleNamespace(
+        number=123,
+        title="Test PR",
+        body="This is a test PR",
+        user=SimpleNamespace(login="testuser"),
+        labels=list(_LABELS),
+        merged_at=None,
+        html_url="https://github.com/test/repo/pull/123",
+        commits=3,
+        additions=50,
+        deletions=10,
+        changed_files=5,
+        get_files=lambda: []
+    )
     
-    # Mock PR object
-    mock_pr = Mock()
-    mock_pr.number = 123
-    mock_pr.title = "Test PR"
-    mock_pr.body = "This is a test PR"
-    mock_pr.user.login = "testuser"
-    mock_pr.labels = [Mock(name="bug"), Mock(name="urgent")]
-    mock_pr.merged_at = None
-    mock_pr.html_url = "https://github.com/test/repo/pull/123"
-    mock_pr.commits = 3
-    mock_pr.additions = 50
-    mock_pr.deletions = 10
-    mock_pr.changed_files = 5
-    
-    pr_info = agent._extract_pr_info(mock_pr)
+    pr_info = release_agent._extract_pr_info(mock_pr)
     
     assert pr_info.number == 123
     assert pr_info.title == "Test PR"
     assert pr_info.author == "testuser"
-    assert len(pr_info.labels) == 2
+    assert pr_info.labels == ["bug", "urgent"]
     assert pr_info.commits_count == 3
 
 
+def test_analyze_releases_preserves_order(release_agent):
+    """Test bulk release analysis returns results in input order."""
+    with patch.object(release_agent, 'analyze_release') as mock_analyze:
+        mock_analyze.side_effect = lambda repo, tag: f"{repo}:{tag}"
+        
+        results = release_agent.analyze_releases(
+            [("owner/repo", "v1.0.0"), ("owner/repo", "v2.0.0"), ("other/repo", "v3.0.0")],
+            max_concurrency=2
+        )
+    
+    assert results == ["owner/repo:v1.0.0", "owner/repo:v2.0.0", "other/repo:v3.0.0"]
+
+
+def test_analyze_releases_rejects_non_positive_concurrency(release_agent):
+    """Test that bulk analysis needs at least one worker."""
+    with pytest.raises(ValueError, match="max_concurrency"):
+        release_agent.analyze_releases([("owner/repo", "v1.0.0")], max_concurrency=0)
+
+
+def test_pr_fetches_share_one_concurrency_bound(release_agent, monkeypatch):
+    """Test that concurrent PR fetches never exceed the shared slot count."""
+    monkeypatch.setattr(release_agent, "_pr_cache", OrderedDict())
+    monkeypatch.setattr(release_agent, "_pr_fetch_slots", threading.BoundedSemaphore(2))
+    
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    
+    def get_pull(number):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        return Mock(merged=False)
+    
+    mock_repo = Mock()
+    mock_repo.full_name = "owner/repo"
+    mock_repo.get_pull.side_effect = get_pull
+    
+    # Several releases' worth of fetchers hitting the agent at once
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda n: release_agent._fetch_pr_info(mock_repo, n), range(16)))
+    
+    assert mock_repo.get_pull.call_count == 16
+    assert peak <= 2
+
+
+def test_convenience_functions_share_agent():
+    """Test that convenience functions reuse a single agent instance."""
+    from agents_playground.github_release_agent import _get_agent
+    
+    assert _get_agent() is _get_agent()
+
+
+def test_fetch_pr_info_caches_merged_prs(release_agent, monkeypatch):
+    """Test that a merged PR is only fetched from GitHub once."""
+    monkeypatch.setattr(release_agent, "_pr_cache", OrderedDict())
+    
+    mock_repo = Mock()
+    mock_repo.full_name = "owner/repo"
+    mock_repo.get_pull.return_value = Mock(merged=True)
+    
+    pr_info = SimpleNamespace(files=[])
+    with patch.object(release_agent, '_extract_pr_info', return_value=pr_info):
+        assert release_agent._fetch_pr_info(mock_repo, 42) is pr_info
+        assert release_agent._fetch_pr_info(mock_repo, 42) is pr_info
+    
+    mock_repo.get_pull.assert_called_once_with(42)
+
+
+def test_fetch_pr_info_does_not_cache_incomplete_files(release_agent, monkeypatch):
+    """Test that a PR whose file list could not be fetched is fetched again next time."""
+    monkeypatch.setattr(release_agent, "_pr_cache", OrderedDict())
+    
+    mock_pr = SimpleNamespace(
+        number=42, title="Test PR", user=SimpleNamespace(login="testuser"), labels=[],
+        merged=True, merged_at=None, html_url="", commits=1, additions=1, deletions=0, changed_files=1,
+        get_files=Mock(side_effect=[Exception("connection reset"), []])
+    )
+    mock_repo = Mock()
+    mock_repo.full_name = "owner/repo"
+    mock_repo.get_pull.return_value = mock_pr
+    
+    assert release_agent._fetch_pr_info(mock_repo, 42).files is None
+    assert release_agent._fetch_pr_info(mock_repo, 42).files == []
+    
+    assert mock_repo.get_pull.call_count == 2
+    assert list(release_agent._pr_cache) == [("owner/repo", 42)]
+
+
+def test_pr_cache_evicts_least_recently_used(release_agent, monkeypatch):
+    """Test that the PR cache stays within PR_CACHE_SIZE."""
+    monkeypatch.setattr(release_agent, "_pr_cache", OrderedDict())
+    monkeypatch.setattr(release_agent, "PR_CACHE_SIZE", 2)
+    
+    mock_repo = Mock()
+    mock_repo.full_name = "owner/repo"
+    mock_repo.get_pull.return_value = Mock(merged=True)
+    
+    with patch.object(release_agent, '_extract_pr_info', side_effect=lambda pr: Mock()):
+        for number in (1, 2, 1, 3):
+            release_agent._fetch_pr_info(mock_repo, number)
+    
+    assert list(release_agent._pr_cache) == [("owner/repo", 1), ("owner/repo", 3)]
+
+
+def test_fetch_pr_info_retries_after_rate_limit(release_agent, monkeypatch):
+    """Test that a rate-limited PR fetch waits for the reset and retries."""
+    from github import RateLimitExceededException
+    
+    monkeypatch.setattr(release_agent, "github", Mock(rate_limiting_resettime=0))
+    monkeypatch.setattr(release_agent, "_pr_cache", OrderedDict())
+    
+    mock_repo = Mock()
+    mock_repo.full_name = "owner/repo"
+    mock_repo.get_pull.side_effect = [
+        RateLimitExceededException(403, {"message": "rate limited"}, {}),
+        Mock(merged=True)
+    ]
+    
+    pr_info = SimpleNamespace(files=[])
+    with patch.object(release_agent, '_extract_pr_info', return_value=pr_info), \
+         patch('agents_playground.github_release_agent._sleep') as mock_sleep:
+        assert release_agent._fetch_pr_info(mock_repo, 7) is pr_info
+    
+    assert mock_repo.get_pull.call_count == 2
+    mock_sleep.assert_called_once_with(1)
+
+
+def test_fetch_pr_info_retries_when_files_are_rate_limited(release_agent, monkeypatch):
+    """Test that a rate limit hit while listing a PR's files is retried, not cached as empty."""
+    from github import RateLimitExceededException
+    
+    monkeypatch.setattr(release_agent, "github", Mock(rate_limiting_resettime=0))
+    monkeypatch.setattr(release_agent, "_pr_cache", OrderedDict())
+    
+    changed_file = SimpleNamespace(filename="modules/exampleBidAdapter.js", status="modified",
+                                   additions=1, deletions=0, patch=None)
+    mock_pr = SimpleNamespace(
+        number=7, title="Test PR", user=SimpleNamespace(login="testuser"), labels=[],
+        merged=True, merged_at=None, html_url="", commits=1, additions=1, deletions=0, changed_files=1,
+        get_files=Mock(side_effect=[
+            RateLimitExceededException(403, {"message": "rate limited"}, {}),
+            [changed_file]
+        ])
+    )
+    mock_repo = Mock()
+    mock_repo.full_name = "owner/repo"
+    mock_repo.get_pull.return_value = mock_pr
+    
+    with patch('agents_playground.github_release_agent._sleep') as mock_sleep:
+        pr_info = release_agent._fetch_pr_info(mock_repo, 7)
+    
+    assert pr_info.files == ["modules/exampleBidAdapter.js"]
+    mock_sleep.assert_called_once_with(1)
+
+
+def test_analyze_release_memoizes_results(release_agent, monkeypatch):
+    """Test that repeat analyses of the same release are served from memory until the TTL expires."""
+    monkeypatch.setattr(release_agent, "github", Mock())
+    monkeypatch.setattr(release_agent, "_analysis_cache", OrderedDict())
+    monkeypatch.setattr(github_release_agent, "_monotonic", lambda: 1000.0)
+    
+    with patch.object(release_agent, '_get_prs_in_release', return_value=[]):
+        first = release_agent.analyze_release("owner/repo", "v1.0.0")
+        second = release_agent.analyze_release("owner/repo", "v1.0.0")
+        
+        assert first is second
+        release_agent.github.get_repo.assert_called_once_with("owner/repo")
+        
+        # An expired entry is re-analyzed, e.g. after the release was re-tagged
+        monkeypatch.setattr(github_release_agent, "_monotonic", lambda: 1000.0 + release_agent.ANALYSIS_CACHE_TTL)
+        third = release_agent.analyze_release("owner/repo", "v1.0.0")
+    
+    assert third is not first
+    assert release_agent.github.get_repo.call_count == 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file